@@ -11,7 +11,7 @@ This algorithm implements and modifies the design of Dong and Li, 1999
 """
 
 import itertools as it
-from collections import Iterable
+from collections.abc import Iterable
 
 
 def border_diff(u_list, r_list):
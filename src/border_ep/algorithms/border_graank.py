@@ -14,6 +14,7 @@ import sys
 import ntpath
 
 from .mbdll_border import *
+from .common.dataset import Dataset
 
 
 def Trad(fileName):
@@ -38,13 +39,18 @@ def Trad(fileName):
             return title, [[float(temp[j][i]) for j in range(1, len(temp))] for i in range(len(temp[0]))]
 
 
-def GraankInit(T,eq=False):
+def GraankInit(T,eq=False,a=None):
     res=[]
     n=len(T[0])
     #print T
     for i in range(len(T)):
         npl=str(i+1)+'+'
         nm=str(i+1)+'-'
+        if a is not None:
+            # 1-item support from the tie counts: skip the bins of invalid attributes
+            temp=float(Dataset.count_rank_pairs(T[i],eq))/float(n*(n-1.0)/2.0)
+            if temp<a:
+                continue
         tempp=np.zeros((n,n),dtype= 'bool')
         tempm=np.zeros((n,n),dtype= 'bool')
         #print i
@@ -147,7 +153,7 @@ def Graank(D_in,a,eq=False):
     res2 = []
     temp = 0
     n = len(T[0])
-    G = GraankInit(T,eq)
+    G = GraankInit(T,eq,a)
     #print G
     for i in G:
         temp = float(np.sum(i[1]))/float(n*(n-1.0)/2.0)
@@ -10,127 +10,582 @@
 
 """
 
+import time
+import copy
 import numpy as np
-from numpy import random as rand
+import multiprocessing as mp
+from multiprocessing.pool import ThreadPool
 import matplotlib.pyplot as plt
 from .gp import GI, GP
 from .dataset import Dataset
+from .pheromone import Pheromone
+from .pattern_index import PatternIndex
+from .bin_cache import BinCache
+from .profile_cpu import Profile
 
 
 class GradACO:
 
-    def __init__(self, f_path, min_supp, eq):
-        self.d_set = Dataset(f_path, min_supp, eq)
+    batch_size = 0  # ants per generation (0: one ant at a time)
+    seed = None  # seed of the random generator (None: fresh entropy)
+    rng = None
+    store = None  # pheromone checkpoints (PheromoneStore): warm start and save
+    store_tag = ''
+    p_prior = None  # sampling prior added to p_matrix (see set_prior)
+    init_gps = ()  # patterns tried by the first ants (e.g. winners of the previous step)
+    winner_gps = ()  # winners of the last run
+    bin_cache = None  # LRU cache of partial AND bins (see set_cache)
+    use_pairs = False  # precompute the 2-item supports before every run (see set_pairs)
+    pair_supps = None  # supports of the 2-item patterns by item id 2 * col + sign (see init_pairs)
+    pair_prior = None  # sampling prior of the frequent 2-item patterns (see init_pairs)
+    top_k = 0  # top-k mode: the k winners of highest support (see set_top_k)
+    # anytime budgets and stopping criteria (0: not used)
+    max_time = 0  # seconds
+    max_ants = 0
+    max_gens = 0
+    max_repeat = 1  # repeated (or dominated) patterns in a row
+    max_repeat_top_k = 1000  # top-k mode: repeated patterns in a row while fewer than k winners are found
+    max_stable = 0  # generations without a new winner
+    min_entropy = 0  # mean pheromone entropy of the attributes (0 ... 1)
+    e_factor = 0  # evaporation factor
+    # multi-colony mode
+    num_colonies = 0  # colonies run in parallel (0: one sequential colony)
+    colony_gens = 100  # generations of every colony between two merges
+    use_threads = False  # worker threads instead of processes
+
+    def __init__(self, f_path, min_supp, eq, packed=False, matrix_free=False, batch_size=0, seed=None):
+        self.d_set = Dataset(f_path, min_supp, eq, packed=packed, matrix_free=matrix_free)
         self.d_set.init_attributes()
         self.attr_index = self.d_set.attr_cols
-        # self.e_factor = 0.1  # evaporation factor
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
         self.p_matrix = np.ones((self.d_set.column_size, 3), dtype=float)
+        self.batch_size = batch_size
+
+    @property
+    def p_matrix(self):
+        return self.pheromone.p_matrix
+
+    @p_matrix.setter
+    def p_matrix(self, p_matrix):
+        # every variant sets p_matrix: it is held by the (shared) pheromone engine
+        if self.rng is None:
+            self.rng = np.random.default_rng(self.seed)
+        self.pheromone = Pheromone(p_matrix, self.rng, self.get_prior())
+
+    def set_seed(self, seed):
+        # seed (int or sequence of ints) of the generator that draws the ants
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.pheromone.rng = self.rng
 
     def deposit_pheromone(self, pattern):
-        lst_attr = []
-        for obj in pattern.gradual_items:
-            # print(obj.attribute_col)
-            attr = obj.attribute_col
-            symbol = obj.symbol
-            lst_attr.append(attr)
-            i = attr
-            if symbol == '+':
-                self.p_matrix[i][0] += 1
-            elif symbol == '-':
-                self.p_matrix[i][1] += 1
-        for index in self.attr_index:
-            if int(index) not in lst_attr:
-                i = int(index)
-                self.p_matrix[i][2] += 1
+        self.pheromone.deposit(self.attr_index, pattern)
+
+    def evaporate_pheromone(self):
+        self.pheromone.evaporate(self.attr_index, self.e_factor)
+
+    def set_budget(self, max_time=0, max_ants=0, max_gens=0, max_repeat=None, max_stable=0, min_entropy=0,
+                   e_factor=0):
+        # the colony stops at the first budget used up (or criterion met) and returns
+        # the winners found so far. max_repeat is off (0) unless it is the only budget,
+        # otherwise it would stop the colony long before the others are used up
+        if max_repeat is None:
+            is_set = (max_time > 0) or (max_ants > 0) or (max_gens > 0) or (max_stable > 0)
+            max_repeat = 0 if is_set else 1
+        if (max_time <= 0) and (max_ants <= 0) and (max_gens <= 0) and (max_repeat <= 0) and (max_stable <= 0):
+            raise Exception("Set a time, ants, generations, repeat or stable budget")
+        if (e_factor < 0) or (e_factor >= 1):
+            raise Exception("Evaporation factor must be in [0, 1)")
+        self.max_time = max_time
+        self.max_ants = max_ants
+        self.max_gens = max_gens
+        self.max_repeat = max_repeat
+        self.max_stable = max_stable
+        self.min_entropy = min_entropy
+        self.e_factor = e_factor
+
+    def set_colonies(self, num_colonies, colony_gens=100, use_threads=False):
+        # colonies explore the same data set (read-only bins) in parallel; their pheromone and
+        # winners are merged every colony_gens generations
+        if colony_gens <= 0:
+            raise Exception("Colony generations must be greater than 0")
+        if num_colonies <= 0:
+            num_colonies = Profile.get_num_cores()
+        self.num_colonies = num_colonies
+        self.colony_gens = colony_gens
+        self.use_threads = use_threads
+
+    def start_budget(self):
+        self.start_time = time.time()
+        self.num_ants = 0
+        self.num_gens = 0
+        self.stable_gens = 0
+
+    def next_generation(self):
+        self.num_gens += 1
+        self.stable_gens += 1
+        if self.e_factor > 0:
+            self.evaporate_pheromone()
+
+    def is_exhausted(self, repeated, num_winners=0):
+        if 0 < self.max_repeat <= repeated:
+            # top-k mode: the k winners are not found yet (fewer may exist)
+            if (num_winners >= self.top_k) or (repeated >= max(self.max_repeat, self.max_repeat_top_k)):
+                return True
+        if (0 < self.max_ants <= self.num_ants) or (0 < self.max_gens <= self.num_gens):
+            return True
+        if 0 < self.max_stable <= self.stable_gens:
+            return True
+        if (self.max_time > 0) and ((time.time() - self.start_time) >= self.max_time):
+            return True
+        if (self.min_entropy > 0) and (self.pheromone.get_entropy(self.attr_index) <= self.min_entropy):
+            return True
+        return False
+
+    def set_prior(self, p_prior, init_gps=()):
+        # warm start that leaves p_matrix (and the supports derived from it) untouched
+        self.p_prior = p_prior
+        self.pheromone.prior = self.get_prior()
+        self.pheromone.update_probs()
+        self.init_gps = tuple(init_gps)
+
+    def get_prior(self):
+        # sampling prior: warm start (p_prior) and frequent pairs (pair_prior)
+        if self.pair_prior is None:
+            return self.p_prior
+        if self.p_prior is None:
+            return self.pair_prior
+        return self.p_prior + self.pair_prior
+
+    def set_cache(self, max_size=1024, max_bytes=2 ** 28):
+        # validate_gp reuses the partial ANDs of the items shared by the ants
+        self.bin_cache = BinCache(max_size, max_bytes)
+
+    def set_pairs(self, use_pairs=True):
+        # run_ant_colony starts with init_pairs
+        self.use_pairs = use_pairs
+
+    def init_pairs(self):
+        # supports of all the 2-item patterns: an item that forms an infrequent pair with
+        # the items kept so far is skipped without ANDing (the support can only be lower).
+        # Every frequent canonical pair (a+, b) adds its support to a+ and to b in the
+        # sampling prior (-1: attribute in no frequent pair, never sampled). The bins of a
+        # colony do not change: the supports and the prior are computed once
+        if self.pair_supps is not None:
+            return
+        min_supp = self.d_set.thd_supp
+        n = self.d_set.attr_size
+        size = self.d_set.column_size
+        pair_supps = np.zeros((2 * size, 2 * size), dtype=float)
+        cols = [col for col in self.attr_index if self.get_item_bin(GI(col, '+')) is not None]
+        for a in range(len(cols)):
+            bin_a = self.get_item_bin(GI(cols[a], '+'))
+            for b in range(a + 1, len(cols)):
+                for symbol in ['+', '-']:
+                    supp = self.bin_and([bin_a, self.get_item_bin(GI(cols[b], symbol))], n)[1]
+                    i, j = 2 * cols[a], 2 * cols[b] + (0 if symbol == '+' else 1)
+                    # (a+, b) and its inverse (a-, inv b)
+                    pair_supps[i, j] = pair_supps[j, i] = supp
+                    pair_supps[i ^ 1, j ^ 1] = pair_supps[j ^ 1, i ^ 1] = supp
+        self.pair_supps = pair_supps
+        pair_prior = np.zeros((size, 3), dtype=float)
+        for a in range(len(cols)):
+            for b in range(a + 1, len(cols)):
+                for k in range(2):
+                    supp = pair_supps[2 * cols[a], 2 * cols[b] + k]
+                    if supp >= min_supp:
+                        pair_prior[cols[a], 0] += supp
+                        pair_prior[cols[b], k] += supp
+        is_free = np.all(pair_prior[:, :2] <= 0, axis=1)
+        pair_prior[is_free, 0: 2] = -1
+        self.pair_prior = pair_prior
+        self.pheromone.prior = self.get_prior()
+        self.pheromone.update_probs()
+
+    def is_pair_valid(self, key, item):
+        # no infrequent pair between item and the items in key
+        if self.pair_supps is None or len(key) <= 0:
+            return True
+        return bool(np.all(self.pair_supps[list(key), item] >= self.d_set.thd_supp))
+
+    def set_top_k(self, top_k):
+        # min_supp becomes the initial threshold only: once k winners are found, it is raised
+        # to the k-th best support (the patterns below it are not tested any more). Until
+        # then, max_repeat does not stop the colony (see max_repeat_top_k)
+        if top_k <= 0:
+            raise Exception("Top-k must be greater than 0")
+        self.top_k = top_k
+
+    def init_top_k(self):
+        # there are k 2-item patterns with a support of at least the k-th best 2-item
+        # support: the threshold starts there (see init_pairs)
+        self.init_pairs()
+        ids = np.arange(self.pair_supps.shape[0])
+        # (a+, b) with a < b: every pair once
+        is_pair = (ids[:, np.newaxis] % 2 == 0) & (ids[np.newaxis, :] > ids[:, np.newaxis] + 1)
+        supps = np.sort(self.pair_supps[is_pair])[::-1]
+        if supps.size >= self.top_k:
+            self.d_set.thd_supp = max(self.d_set.thd_supp, GradACO.get_top_k_thd(supps[self.top_k - 1]))
+
+    def update_top_k(self, winner_gps):
+        # raise the threshold to the k-th best support and drop the winners below it
+        # (their sub-patterns may be among the top-k)
+        if (self.top_k <= 0) or (len(winner_gps) < self.top_k):
+            return winner_gps
+        supps = sorted([gp.support for gp in winner_gps.patterns], reverse=True)
+        thd_supp = GradACO.get_top_k_thd(supps[self.top_k - 1])
+        if thd_supp <= self.d_set.thd_supp:
+            return winner_gps
+        self.d_set.thd_supp = thd_supp
+        top_gps = PatternIndex()
+        for gp in winner_gps.patterns:
+            if gp.support >= self.d_set.thd_supp:
+                top_gps.append(gp)
+        return top_gps
+
+    @staticmethod
+    def get_top_k_thd(supp):
+        # lowest support that is rounded (see GP.set_support) to the rounded supp: the
+        # threshold is compared to the exact supports of the bins and to the rounded
+        # supports of the winners
+        return round(float(supp), 3) - 0.0005
+
+    def is_dominated(self, winner_gps, pattern):
+        # a winner is a superset of pattern (or of its inverse); in the top-k mode the
+        # sub-patterns of the winners have a higher support: they are tested too
+        return (self.top_k <= 0) and winner_gps.has_superset(pattern)
+
+    def set_store(self, store, tag=''):
+        self.store = store
+        self.store_tag = tag
 
     def run_ant_colony(self):
+        if self.d_set.get_valid_size() < 2:
+            return []
+        if self.store is not None:
+            self.store.load(self, self.store_tag)
         min_supp = self.d_set.thd_supp
-        winner_gps = list()  # subsets
-        loser_gps = list()  # supersets
+        try:
+            if self.use_pairs:
+                self.init_pairs()
+            if self.top_k > 0:
+                self.init_top_k()
+            if self.num_colonies > 1:
+                winner_gps = self.run_multi_colony()
+            elif self.batch_size > 0:
+                winner_gps = self.run_batch_colony()
+            else:
+                winner_gps = self.run_serial_colony()
+            if self.top_k > 0:
+                winner_gps = sorted(winner_gps, key=lambda gp: -gp.support)[:self.top_k]
+        finally:
+            # top-k raises the threshold of the (shared) data set while it runs
+            self.d_set.thd_supp = min_supp
+        self.save_state()
+        self.winner_gps = winner_gps
+        return winner_gps
+
+    def save_state(self):
+        # end of a run: checkpoint of the pheromone (see set_store)
+        if self.store is not None:
+            self.store.save(self, self.store_tag)
+
+    def run_multi_colony(self):
+        global shared_colony
+        winner_gps = PatternIndex()
         repeated = 0
-        if len(self.d_set.valid_bins) < 2:
-            return []
-        while repeated < 1:
+        self.start_budget()
+        # forked workers inherit this instance (and its bins): it is not pickled
+        is_fork = (not self.use_threads) and (mp.get_start_method() == 'fork')
+        shared_colony = self
+        if self.use_threads:
+            pool = ThreadPool(self.num_colonies)
+        else:
+            pool = mp.Pool(self.num_colonies)
+        with pool:
+            while not self.is_exhausted(repeated, len(winner_gps)):
+                state = self.get_colony_state()
+                budget = self.get_colony_budget()
+                # an independent stream for every colony, drawn from this colony's generator
+                seeds = self.rng.integers(2 ** 63, size=self.num_colonies)
+                tasks = list()
+                for i in range(self.num_colonies):
+                    tasks.append((None if is_fork else self, state, winner_gps.patterns, budget, int(seeds[i])))
+                results = pool.map(run_colony, tasks)
+                self.init_gps = ()
+
+                # merge the pheromone and the winners of all the colonies
+                self.set_colony_state(self.merge_colony_states(state, results))
+                is_new = False
+                for res in results:
+                    self.num_ants += res['num_ants']
+                    for gp in res['patterns']:
+                        if not (winner_gps.contains(gp) or self.is_dominated(winner_gps, gp)):
+                            winner_gps.append(gp)
+                            is_new = True
+                winner_gps = self.update_top_k(winner_gps)
+                gens = max([res['num_gens'] for res in results])
+                self.num_gens += gens
+                if is_new:
+                    repeated = 0
+                    self.stable_gens = 0
+                else:
+                    repeated += 1
+                    self.stable_gens += gens
+        shared_colony = None
+        return winner_gps.patterns
+
+    def get_colony_budget(self):
+        # budget of every colony until the next merge
+        max_gens = self.colony_gens
+        if self.max_gens > 0:
+            max_gens = min(max_gens, self.max_gens - self.num_gens)
+        max_ants = 0
+        if self.max_ants > 0:
+            max_ants = max(1, (self.max_ants - self.num_ants) // self.num_colonies)
+        max_time = 0
+        if self.max_time > 0:
+            max_time = max(1e-3, self.max_time - (time.time() - self.start_time))
+        return {'max_time': max_time, 'max_ants': max_ants, 'max_gens': max_gens,
+                'max_repeat': self.max_repeat, 'max_stable': self.max_stable,
+                'min_entropy': self.min_entropy, 'e_factor': self.e_factor}
+
+    def get_colony_state(self):
+        # pheromone (and deposits) that the colonies start from and merge
+        return {'p_matrix': self.p_matrix - 1}
+
+    def set_colony_state(self, state):
+        self.p_matrix = state['p_matrix'] + 1
+
+    def merge_colony_states(self, state, results):
+        # deposits of all the colonies on the (evaporated) start state
+        decays = [res['decay'] for res in results]
+        merged = dict()
+        for key, value in state.items():
+            if isinstance(value, np.ndarray):
+                merged[key] = np.mean(decays) * value
+                for res, decay in zip(results, decays):
+                    merged[key] = merged[key] + (res['state'][key] - decay * value)
+            else:
+                merged[key] = copy.deepcopy(value)
+                # nested lists (e.g. time stamps): append what every colony added
+                for res in results:
+                    for i in range(len(value)):
+                        for j in range(len(value[i])):
+                            merged[key][i][j].extend(res['state'][key][i][j][len(value[i][j]):])
+        return merged
+
+    def run_serial_colony(self, winner_gps=None):
+        # one ant per generation
+        if winner_gps is None:
+            winner_gps = PatternIndex()  # subsets
+        loser_gps = PatternIndex()  # supersets
+        repeated = 0
+        self.start_budget()
+        while not self.is_exhausted(repeated, len(winner_gps)):
+            self.num_ants += 1
+            self.next_generation()
             rand_gp = self.generate_random_gp()
             if len(rand_gp.gradual_items) > 1:
                 # print(rand_gp.get_pattern())
-                exits = GradACO.is_duplicate(rand_gp, winner_gps, loser_gps)
+                exits = (winner_gps.contains(rand_gp) or loser_gps.contains(rand_gp))
                 if not exits:
                     repeated = 0
                     # check for anti-monotony
-                    is_super = GradACO.check_anti_monotony(loser_gps, rand_gp, subset=False)
-                    is_sub = GradACO.check_anti_monotony(winner_gps, rand_gp, subset=True)
+                    is_super = loser_gps.has_subset(rand_gp)
+                    is_sub = self.is_dominated(winner_gps, rand_gp)
                     if is_super or is_sub:
                         continue
                     gen_gp = self.validate_gp(rand_gp)
-                    if gen_gp.support >= min_supp:
-                        self.deposit_pheromone(gen_gp)
-                        is_present = GradACO.is_duplicate(gen_gp, winner_gps, loser_gps)
-                        is_sub = GradACO.check_anti_monotony(winner_gps, gen_gp, subset=True)
+                    if gen_gp.support >= self.d_set.thd_supp:
+                        self.deposit_pheromone(GradACO.get_sampled_gp(gen_gp, rand_gp))
+                        is_present = (winner_gps.contains(gen_gp) or loser_gps.contains(gen_gp))
+                        is_sub = self.is_dominated(winner_gps, gen_gp)
                         if is_present or is_sub:
                             repeated += 1
                         else:
                             winner_gps.append(gen_gp)
+                            winner_gps = self.update_top_k(winner_gps)
+                            self.stable_gens = 0
                     else:
                         loser_gps.append(gen_gp)
-                        # update pheromone as irrelevant with loss_sols
-                        # self.vaporize_pheromone(gen_gp, self.e_factor)
                     if set(gen_gp.get_pattern()) != set(rand_gp.get_pattern()):
                         loser_gps.append(rand_gp)
                 else:
                     repeated += 1
-        return winner_gps
+        return winner_gps.patterns
+
+    def run_batch_colony(self, winner_gps=None):
+        # every iteration: sample a generation of ants, validate the new ones in
+        # one batch (validate_gps), then deposit in the order they were sampled
+        if winner_gps is None:
+            winner_gps = PatternIndex()  # subsets
+        loser_gps = PatternIndex()  # supersets
+        repeated = 0
+        self.start_budget()
+        while not self.is_exhausted(repeated, len(winner_gps)):
+            self.next_generation()
+            lst_gps = list()
+            new_gps = dict()
+            for i in range(self.batch_size):
+                if 0 < self.max_ants <= self.num_ants:
+                    break
+                self.num_ants += 1
+                rand_gp = self.generate_random_gp()
+                if len(rand_gp.gradual_items) > 1:
+                    lst_gps.append(rand_gp)
+                    key = tuple(sorted(rand_gp.get_tuples()))
+                    if key not in new_gps and not (winner_gps.contains(rand_gp) or loser_gps.contains(rand_gp)) and \
+                            not loser_gps.has_subset(rand_gp) and \
+                            not self.is_dominated(winner_gps, rand_gp):
+                        new_gps[key] = rand_gp
+            keys = list(new_gps.keys())
+            gen_gps = dict(zip(keys, self.validate_gps([new_gps[key] for key in keys])))
+
+            for rand_gp in lst_gps:
+                exits = (winner_gps.contains(rand_gp) or loser_gps.contains(rand_gp))
+                if not exits:
+                    repeated = 0
+                    # check for anti-monotony
+                    is_super = loser_gps.has_subset(rand_gp)
+                    is_sub = self.is_dominated(winner_gps, rand_gp)
+                    if is_super or is_sub:
+                        continue
+                    gen_gp = gen_gps[tuple(sorted(rand_gp.get_tuples()))]
+                    if gen_gp.support >= self.d_set.thd_supp:
+                        self.deposit_pheromone(GradACO.get_sampled_gp(gen_gp, rand_gp))
+                        is_present = (winner_gps.contains(gen_gp) or loser_gps.contains(gen_gp))
+                        is_sub = self.is_dominated(winner_gps, gen_gp)
+                        if is_present or is_sub:
+                            repeated += 1
+                        else:
+                            winner_gps.append(gen_gp)
+                            winner_gps = self.update_top_k(winner_gps)
+                            self.stable_gens = 0
+                    else:
+                        loser_gps.append(gen_gp)
+                    if set(gen_gp.get_pattern()) != set(rand_gp.get_pattern()):
+                        loser_gps.append(rand_gp)
+                else:
+                    repeated += 1
+        return winner_gps.patterns
 
     def generate_random_gp(self):
-        p = self.p_matrix
-        n = len(self.attr_index)
+        if len(self.init_gps) > 0:
+            pattern = self.init_gps[0]
+            self.init_gps = self.init_gps[1:]
+            return pattern
         pattern = GP()
-        attrs = np.random.permutation(n)
-        for i in attrs:
-            max_extreme = n * 100
-            x = float(rand.randint(1, max_extreme) / max_extreme)
-            pos = float(p[i][0] / (p[i][0] + p[i][1] + p[i][2]))
-            neg = float((p[i][0] + p[i][1]) / (p[i][0] + p[i][1] + p[i][2]))
-            if x < pos:
-                temp = GI(self.attr_index[i], '+')
-            elif (x >= pos) and (x < neg):
-                temp = GI(self.attr_index[i], '-')
-            else:
-                # temp = GI(self.attr_index[i], 'x')
-                continue
-            pattern.add_gradual_item(temp)
-        return pattern
+        cols, symbols = self.pheromone.sample(self.attr_index)
+        for col, symbol in zip(cols, symbols):
+            pattern.add_gradual_item(GI(col, str(symbol)))
+        # the inverse pattern has the same support: never generate it
+        return pattern.to_canonical()
+
+    @staticmethod
+    def get_sampled_gp(gen_gp, rand_gp):
+        # gen_gp (canonical) in the orientation sampled by the ant: the deposit reinforces
+        # the items of the ant, not the '+' of the lowest attribute only
+        if (len(gen_gp.gradual_items) <= 0) or (gen_gp.gradual_items[0].tuple in rand_gp.get_tuples()):
+            return gen_gp
+        inv_gp = copy.copy(gen_gp)
+        inv_gp.gradual_items = [GI(gi.attribute_col, '-' if gi.symbol == '+' else '+')
+                                for gi in gen_gp.gradual_items]
+        return inv_gp
 
     def validate_gp(self, pattern):
         # pattern = [('2', '+'), ('4', '+')]
+        gen_pattern, bin_data = self.and_items(pattern)
+        if len(gen_pattern.gradual_items) <= 1:
+            return pattern
+        else:
+            return gen_pattern.to_canonical()
+
+    def get_item_bin(self, gi):
+        # O(1) lookup in the bin store (None: invalid gradual item)
+        return self.d_set.get_bin(gi)
+
+    def and_items(self, pattern):
+        # AND the bins of the items of pattern, skipping the items that drop the support
+        # below min_supp: returns the kept items (GP) and their bin
         min_supp = self.d_set.thd_supp
         gen_pattern = GP()
-        bin_data = np.array([])
-
+        bin_data = None
+        key = ()
         for gi in pattern.gradual_items:
-            if self.d_set.invalid_bins.size > 0 and np.any(np.isin(self.d_set.invalid_bins, gi.gradual_item)):
+            temp = self.get_item_bin(gi)
+            if temp is None:
+                continue
+            if bin_data is None:
+                bin_data = temp
+                gen_pattern.add_gradual_item(gi)
+                key = BinCache.get_key(key, gi)
                 continue
+            if not self.is_pair_valid(key, BinCache.get_item(gi)):
+                continue
+            new_key = BinCache.get_key(key, gi)
+            entry = None if self.bin_cache is None else self.bin_cache.get(new_key)
+            if entry is None:
+                temp_bin, supp = self.bin_and([bin_data, temp], self.d_set.attr_size)
+                if self.bin_cache is not None:
+                    self.bin_cache.put(new_key, temp_bin, supp)
             else:
-                #grp = 'dataset/' + self.d_set.step_name + '/valid_bins/' + gi.as_string()
-                #temp = self.d_set.read_h5_dataset(grp)
-                arg = np.argwhere(np.isin(self.d_set.valid_bins[:, 0], gi.gradual_item))
-                if len(arg) > 0:
-                    i = arg[0][0]
-                    bin_obj = self.d_set.valid_bins[i]
-                    if bin_data.size <= 0:
-                        bin_data = np.array([bin_obj[1], bin_obj[1]])
-                        gen_pattern.add_gradual_item(gi)
-                    else:
-                        bin_data[1] = bin_obj[1]
-                        temp_bin, supp = self.bin_and(bin_data, self.d_set.attr_size)
-                        if supp >= min_supp:
-                            bin_data[0] = temp_bin
-                            gen_pattern.add_gradual_item(gi)
-                            gen_pattern.set_support(supp)
-        if len(gen_pattern.gradual_items) <= 1:
-            return pattern
-        else:
-            return gen_pattern
+                temp_bin, supp = entry
+            if supp >= min_supp:
+                bin_data = temp_bin
+                gen_pattern.add_gradual_item(gi)
+                gen_pattern.set_support(supp)
+                key = new_key
+        return gen_pattern, bin_data
+
+    def validate_gps(self, patterns):
+        # validate_gp of many patterns at once: the t-th item of every pattern
+        # is gathered from the bin store and ANDed in one step
+        if (type(self).validate_gp is not GradACO.validate_gp) or \
+                (type(self).get_item_bin is not GradACO.get_item_bin):
+            return [self.validate_gp(pattern) for pattern in patterns]
+        store = self.d_set.bin_store
+        if (store is None) or (not isinstance(store.bins, np.ndarray)) or len(patterns) <= 0:
+            return [self.validate_gp(pattern) for pattern in patterns]
+        min_supp = self.d_set.thd_supp
+        n = self.d_set.attr_size
+        lst_items = [[gi for gi in pattern.gradual_items if store.get_slot(gi.attribute_col) >= 0]
+                     for pattern in patterns]
+        gen_patterns = [GP() for _ in patterns]
+        ants = np.array([i for i in range(len(patterns)) if len(lst_items[i]) > 0], dtype=int)
+        if ants.size <= 0:
+            return patterns
+        bin_data = store.gather([lst_items[i][0].tuple for i in ants])
+        slots = np.full(len(patterns), -1, dtype=int)
+        slots[ants] = np.arange(ants.size)
+        keys = [() for _ in patterns]
+        for i in ants:
+            gen_patterns[i].add_gradual_item(lst_items[i][0])
+            keys[i] = (BinCache.get_item(lst_items[i][0]),)
+        max_len = max([len(items) for items in lst_items])
+        for t in range(1, max_len):
+            ants = np.array([i for i in range(len(patterns)) if len(lst_items[i]) > t and
+                             self.is_pair_valid(keys[i], BinCache.get_item(lst_items[i][t]))], dtype=int)
+            if ants.size <= 0:
+                continue
+            temp_bins = bin_data[slots[ants]] & store.gather([lst_items[i][t].tuple for i in ants])
+            counts = Dataset.count_bins(temp_bins)
+            for k in range(ants.size):
+                i = ants[k]
+                supp = float(counts[k]) / float(n * (n - 1.0) / 2.0)
+                if supp >= min_supp:
+                    bin_data[slots[i]] = temp_bins[k]
+                    gen_patterns[i].add_gradual_item(lst_items[i][t])
+                    gen_patterns[i].set_support(supp)
+                    keys[i] = keys[i] + (BinCache.get_item(lst_items[i][t]),)
+        lst_gps = list()
+        for i in range(len(patterns)):
+            if len(gen_patterns[i].gradual_items) <= 1:
+                lst_gps.append(patterns[i])
+            else:
+                lst_gps.append(gen_patterns[i].to_canonical())
+        return lst_gps
 
     def plot_pheromone_matrix(self):
         x_plot = np.array(self.p_matrix)
@@ -191,6 +646,32 @@ class GradACO:
     @staticmethod
     def bin_and(bins, n):
         # bin_ = np.zeros((n, n), dtype=bool)
-        temp_bin = bins[0] * bins[1]
-        supp = float(np.sum(temp_bin)) / float(n * (n - 1.0) / 2.0)
+        temp_bin = bins[0] & bins[1]
+        supp = float(Dataset.count_bin(temp_bin)) / float(n * (n - 1.0) / 2.0)
         return temp_bin, supp
+
+
+shared_colony = None  # GradACO instance of the multi-colony mode (inherited by forked workers)
+
+
+def run_colony(args):
+    # one colony of a multi-colony run, from the merged pheromone and winners
+    aco, state, patterns, budget, seed = args
+    if aco is None:
+        aco = shared_colony
+    colony = copy.copy(aco)
+    colony.num_colonies = 0
+    colony.seed = seed
+    colony.rng = np.random.default_rng(seed)
+    colony.set_colony_state(copy.deepcopy(state))
+    colony.set_budget(**budget)
+    winner_gps = PatternIndex()
+    for gp in patterns:
+        winner_gps.append(gp)
+    if colony.batch_size > 0:
+        lst_gps = colony.run_batch_colony(winner_gps)
+    else:
+        lst_gps = colony.run_serial_colony(winner_gps)
+    decay = (1 - colony.e_factor) ** colony.num_gens
+    return {'state': colony.get_colony_state(), 'decay': decay, 'patterns': lst_gps[len(patterns):],
+            'num_ants': colony.num_ants, 'num_gens': colony.num_gens}
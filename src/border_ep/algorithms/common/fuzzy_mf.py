@@ -14,10 +14,13 @@
 import numpy as np
 import skfuzzy as fuzzy
 from .gp import TimeLag
+from .dataset import Dataset
+from .rank_supp import RankBin
+from .sparse_bin import SparseBin
 
 
 def calculate_time_lag(bin_data, time_diffs):
-    indices = get_indices(bin_data)
+    indices = get_indices(bin_data, len(time_diffs))
     # stamps = np.absolute(np.array(time_diffs[:, 0]))  # get all stamps from 1st column
     time_lags = get_time_lags(indices, time_diffs)
     time_lag = approximate_fuzzy_support_v2(time_lags)
@@ -70,6 +73,9 @@ def calculate_support(memberships):  # optimized
     return support
 
 
-def get_indices(bin_data):  # optimized
+def get_indices(bin_data, n=None):  # optimized
+    if isinstance(bin_data, (RankBin, SparseBin)) or bin_data.dtype == np.uint64:
+        # bit-packed bin of n rows, matrix-free or sparse bin
+        return Dataset.get_bin_indices(bin_data, n)
     indices = np.argwhere(bin_data == 1)
     return indices
@@ -73,6 +73,22 @@ class GP:
             pattern.append(gi.inv().tolist())
         return pattern
 
+    def is_canonical(self):
+        # a pattern and its inverse have the same support: the canonical one
+        # has '+' on its lowest attribute
+        if len(self.gradual_items) <= 0:
+            return True
+        gi = min(self.gradual_items, key=lambda obj: obj.attribute_col)
+        return gi.symbol == '+'
+
+    def to_canonical(self):
+        if not self.is_canonical():
+            inv_items = list()
+            for gi in self.gradual_items:
+                inv_items.append(GI(gi.attribute_col, '-' if gi.symbol == '+' else '+'))
+            self.gradual_items = inv_items
+        return self
+
     def to_string(self):
         pattern = list()
         for item in self.gradual_items:
@@ -7,69 +7,105 @@
 
 """
 
-import numpy as np
-import gc
+import heapq
+import multiprocessing as mp
 from .fuzzy_mf import calculate_time_lag
 from .dataset import Dataset
 from .gp import GI, GP, TGP
+from .pattern_index import PatternIndex
+from .sparse_bin import SparseBin
+from .profile_cpu import Profile
 
 
 def inv(g_item):
     if g_item[1] == '+':
         temp = tuple([g_item[0], '-'])
+    elif g_item[1] == b'+':
+        temp = tuple([g_item[0], b'-'])
+    elif g_item[1] == b'-':
+        temp = tuple([g_item[0], b'+'])
     else:
         temp = tuple([g_item[0], '+'])
     return temp
 
 
+def is_canonical(item_set):
+    # a pattern and its inverse have the same support: only the one with
+    # '+' on its lowest attribute is generated ('+' wins a tie on that attribute)
+    g_item = min(item_set)
+    return g_item[1] == '+' or g_item[1] == b'+'
+
+
+def get_items(item_set):
+    # items of a 1-itemset (col, symbol) or of a k-itemset {(col, symbol), ...}
+    if isinstance(item_set, tuple):
+        return [item_set]
+    return list(item_set)
+
+
+def join_candidates(R):
+    # canonical (k+1)-itemsets of the k-itemsets in R, with the indices (i, j) of 2 of
+    # their subsets in R: only itemsets that share their first k-1 (sorted) items are
+    # joined and every k-subset (or its inverse) is looked up in a hashed set. The order
+    # (and the (i, j) pair) is the one of the join of all the pairs i < j of R
+    lst_items = [tuple(sorted(get_items(x[0]))) for x in R]
+    index = dict()
+    for i in range(len(lst_items)):
+        index.setdefault(frozenset(lst_items[i]), i)
+    # a subset may be stored as its inverse: both orientations are joined
+    groups = dict()
+    for items in set(lst_items) | {tuple(sorted([inv(x) for x in items])) for items in lst_items}:
+        groups.setdefault(items[:-1], []).append(items[-1])
+
+    lst_cands = dict()
+    for prefix, lasts in groups.items():
+        lasts.sort()
+        for a in range(len(lasts) - 1):
+            for b in range(a + 1, len(lasts)):
+                temp = frozenset(prefix + (lasts[a], lasts[b]))
+                if (temp in lst_cands) or (not is_canonical(temp)):
+                    continue
+                # the join of R[i] | R[j] finds temp only if 2 of its subsets are stored as they are
+                subs = sorted([index[temp - {x}] for x in temp if (temp - {x}) in index])
+                if len(subs) >= 2:
+                    lst_cands[temp] = (subs[0], subs[1])
+    lst_cands = sorted([(i, j, temp) for temp, (i, j) in lst_cands.items()], key=lambda obj: (obj[0], obj[1]))
+
+    res = []
+    seen = set()
+    for i, j, temp in lst_cands:
+        if frozenset([inv(x) for x in temp]) in seen:
+            continue
+        seen.add(temp)
+        test = True
+        for x in temp:
+            temp2 = temp - {x}
+            if (temp2 not in index) and (frozenset([inv(y) for y in temp2]) not in index):
+                test = False
+                break
+        if test:
+            res.append((set(temp), i, j))
+    return res
+
+
 def gen_apriori_candidates(R, sup, n):
     res = []
-    I = []
     if len(R) < 2:
         return []
-    try:
-        Ck = [{x[0]} for x in R]
-    except TypeError:
-        Ck = [set(x[0]) for x in R]
-
-    for i in range(len(R) - 1):
-        for j in range(i + 1, len(R)):
-            try:
-                R_i = {R[i][0]}
-                R_j = {R[j][0]}
-                R_o = {R[0][0]}
-            except TypeError:
-                R_i = set(R[i][0])
-                R_j = set(R[j][0])
-                R_o = set(R[0][0])
-            temp = R_i | R_j
-            invtemp = {inv(x) for x in temp}
-            if (len(temp) == len(R_o) + 1) and (not (I != [] and temp in I)) \
-                    and (not (I != [] and invtemp in I)):
-                test = 1
-                for k in temp:
-                    try:
-                        k_set = {k}
-                    except TypeError:
-                        k_set = set(k)
-                    temp2 = temp - k_set
-                    invtemp2 = {inv(x) for x in temp2}
-                    if not temp2 in Ck and not invtemp2 in Ck:
-                        test = 0
-                        break
-                if test == 1:
-                    m = R[i][1] * R[j][1]
-                    t = float(np.sum(m)) / float(n * (n - 1.0) / 2.0)
-                    if t > sup:
-                        res.append([temp, m])
-                I.append(temp)
-                gc.collect()
+    for temp, i, j in join_candidates(R):
+        m = R[i][1] & R[j][1]
+        t = float(Dataset.count_bin(m)) / float(n * (n - 1.0) / 2.0)
+        if t > sup:
+            res.append([temp, m])
     return res
 
 
-def graank(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None):
+def graank(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None, packed=False, matrix_free=False,
+           depth_first=False, num_cores=1, top_k=0):
+    if depth_first or (num_cores != 1) or (top_k > 0):
+        return graank_dfs(f_path, min_sup, eq, t_diffs, d_set, packed, matrix_free, num_cores, top_k)
     if d_set is None:
-        d_set = Dataset(f_path, min_sup, eq)
+        d_set = Dataset(f_path, min_sup, eq, packed=packed, matrix_free=matrix_free)
         d_set.init_attributes()
     else:
         d_set = d_set
@@ -87,13 +123,15 @@ def graank(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None):
             bin_data = valid_bins[i][1]
             # grp = 'dataset/' + d_set.step_name + '/valid_bins/' + gi.as_string()
             # bin_data = d_set.read_h5_dataset(grp)
-            sup = float(np.sum(np.array(bin_data))) / float(n * (n - 1.0) / 2.0)
+            sup = float(Dataset.count_bin(bin_data)) / float(n * (n - 1.0) / 2.0)
             if sup < min_sup:
                 del valid_bins[i]
             else:
                 z = 0
-                while z < (len(patterns) - 1):
-                    if set(patterns[z].get_pattern()).issubset(set(gi_tuple)):
+                while z < len(patterns):
+                    # patterns are canonical: a sub-pattern may be stored as its inverse
+                    if set(patterns[z].get_pattern()).issubset(set(gi_tuple)) or \
+                            set(patterns[z].inv_pattern()).issubset(set(gi_tuple)):
                         del patterns[z]
                     else:
                         z = z + 1
@@ -119,3 +157,212 @@ def graank(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None):
         return d_set, patterns
     else:
         return patterns
+
+
+def graank_dfs(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None, packed=False, matrix_free=False,
+               num_cores=1, top_k=0):
+    # depth-first (Eclat-style) graank: the same patterns as graank, but only the bins on
+    # the current path are kept (memory: depth x n^2 instead of the widest level x n^2).
+    # top_k > 0: the k patterns of highest support instead (min_sup is only a floor)
+    if d_set is None:
+        if (top_k > 0) and (min_sup is None):
+            min_sup = 0
+        d_set = Dataset(f_path, min_sup, eq, packed=packed, matrix_free=matrix_free)
+        d_set.init_attributes()
+    else:
+        min_sup = d_set.thd_supp
+    patterns = mine_dfs(d_set.valid_bins, d_set.attr_size, min_sup, t_diffs, num_cores, top_k)
+    if t_diffs is None:
+        return d_set, patterns
+    else:
+        return patterns
+
+
+def mine_dfs(valid_bins, n, min_sup, t_diffs=None, num_cores=1, top_k=0):
+    # maximal patterns of the [gradual item, bin] pairs of valid_bins; with num_cores > 1
+    # (0: all the cores) the prefix classes are mined in a pool of processes.
+    # top_k > 0: the k patterns of highest support, mined in one process: the threshold is
+    # raised to the k-th best support found so far and prunes all the patterns below it
+    global shared_miner
+    lst_bins = dict()
+    for obj in valid_bins:
+        lst_bins[tuple(obj[0])] = obj[1]
+    items = sorted(lst_bins.keys())
+    # top: [k, heap of the k best (support, -order, items, t_lag), order, threshold]
+    top = None if top_k <= 0 else [top_k, list(), 0, min_sup]
+    miner = [lst_bins, set(), min_sup, n, t_diffs, list(), top]
+    if num_cores <= 0:
+        num_cores = Profile.get_num_cores()
+    if top is not None:
+        num_cores = 1
+    # forked workers inherit the miner (and its bins): it is not pickled
+    is_fork = (mp.get_start_method() == 'fork')
+
+    # 1. frequent (canonical) pairs: an item extends a prefix only if it forms
+    # a frequent pair (or inverse pair) with the last item of the prefix
+    roots = [items[a] for a in range(len(items)) if is_canonical([items[a]])]
+    tasks = [(None if is_fork else miner, item, items[items.index(item) + 1:]) for item in roots]
+    shared_miner = miner
+    if num_cores > 1:
+        with mp.Pool(num_cores) as pool:
+            lst_exts = pool.map(fetch_pairs, tasks)
+    else:
+        lst_exts = [fetch_pairs(task) for task in tasks]
+    for item, exts in zip(roots, lst_exts):
+        for x, _ in exts:
+            miner[1].add(frozenset([item, x]))
+            miner[1].add(frozenset([inv(item), inv(x)]))
+
+    # 2. one class for every frequent pair: the patterns that start with it, mined
+    # depth-first (the largest classes first, to balance the workers)
+    tasks = list()
+    for item, exts in zip(roots, lst_exts):
+        for k in range(len(exts)):
+            x, sup = exts[k]
+            if (top is not None) and (x[0] == item[0]):
+                continue
+            size = len([y for y, _ in exts[k + 1:] if frozenset([x, y]) in miner[1]])
+            tasks.append((size, len(tasks), (None if is_fork else miner, (item, x), sup, exts[k + 1:])))
+    if top is None:
+        tasks.sort(key=lambda obj: -obj[0])
+    else:
+        # best first: the threshold rises faster
+        tasks.sort(key=lambda obj: -obj[2][2])
+    lst_leaves = [None] * len(tasks)
+    shared_miner = miner
+    if (num_cores > 1) and (len(tasks) > 1):
+        with mp.Pool(min(num_cores, len(tasks))) as pool:
+            for i, leaves in pool.imap_unordered(mine_class, [task[1:] for task in tasks]):
+                lst_leaves[i] = leaves
+    else:
+        for task in tasks:
+            i, leaves = mine_class(task[1:])
+            lst_leaves[i] = leaves
+    shared_miner = None
+    if top is not None:
+        return get_top_k(top[1], t_diffs)
+    lst_cands = [cand for leaves in lst_leaves for cand in leaves]
+
+    # 3. leaves with a frequent superset (or a superset of their inverse) are not maximal
+    index = PatternIndex()
+    for gp, t_lag in sorted(lst_cands, key=lambda obj: -len(obj[0].gradual_items)):
+        if not index.has_superset(gp):
+            index.append(gp)
+    max_gps = set([id(gp) for gp in index.patterns])
+    patterns = list()
+    for gp, t_lag in sorted(lst_cands, key=lambda obj: len(obj[0].gradual_items)):
+        if id(gp) not in max_gps:
+            continue
+        if t_diffs is None:
+            patterns.append(gp)
+        elif t_lag.valid:
+            patterns.append(TGP(gp=gp, t_lag=t_lag))
+    return patterns
+
+
+shared_miner = None  # miner of mine_dfs (inherited by forked workers)
+
+
+def fetch_pairs(args):
+    # frequent pairs of item with the items after it: [(item, support), ...]
+    miner, item, tail = args
+    if miner is None:
+        miner = shared_miner
+    lst_bins, _, min_sup, n = miner[:4]
+    num_pairs = float(n * (n - 1.0) / 2.0)
+    exts = list()
+    for x in tail:
+        sup = float(Dataset.count_bin(lst_bins[item] & lst_bins[x])) / num_pairs
+        if sup > min_sup:
+            exts.append((x, sup))
+    return exts
+
+
+def mine_class(args):
+    # leaves of the class of the patterns that start with prefix
+    i, (miner, prefix, sup, tail) = args
+    if miner is None:
+        miner = shared_miner
+    miner = list(miner)
+    miner[5] = list()
+    lst_bins = miner[0]
+    extend_prefix(miner, prefix, sup, lst_bins[prefix[0]] & lst_bins[prefix[1]], tail)
+    return i, miner[5]
+
+
+def extend_prefix(miner, prefix, sup, bin_data, tail):
+    # miner: [item bins, frequent pairs, min_sup, number of rows, t_diffs, leaves, top-k]
+    lst_bins, pairs, min_sup, n, t_diffs, lst_cands, top = miner
+    if top is not None:
+        if not add_top_k(top, prefix, sup, bin_data, t_diffs):
+            # the threshold was raised since prefix was found
+            return
+        min_sup = top[3]
+    num_pairs = float(n * (n - 1.0) / 2.0)
+    count = int(round(sup * num_pairs))
+    tail = [x for x, _ in tail if frozenset([prefix[-1], x]) in pairs]
+    if top is not None:
+        # top-k: no pattern with both items of an attribute (their support is only the ties)
+        tail = [x for x in tail if x[0] not in [obj[0] for obj in prefix]]
+    if (len(tail) > 1) and SparseBin.is_sparse(bin_data, count):
+        # few pairs left: the extensions are tested on the pairs of prefix only
+        bin_data = SparseBin.from_bin(bin_data)
+
+    # supports of the extensions of prefix (their bins are freed at once)
+    exts = list()
+    for x in tail:
+        if isinstance(bin_data, SparseBin):
+            # support of prefix minus the pairs that are lost
+            temp_sup = float(count - bin_data.get_lost_count(lst_bins[x])) / num_pairs
+        else:
+            temp_sup = float(Dataset.count_bin(bin_data & lst_bins[x])) / num_pairs
+        if temp_sup > min_sup:
+            exts.append((x, temp_sup))
+    if (len(exts) == 0) and (top is None):
+        # leaf: maximal unless a superset is found in another branch
+        t_lag = None if t_diffs is None else calculate_time_lag(bin_data, t_diffs)
+        lst_cands.append((get_gp(prefix, sup), t_lag))
+        return
+    if top is not None:
+        exts.sort(key=lambda obj: -obj[1])
+
+    # one extension at a time: only its bin is added to the path
+    for k in range(len(exts)):
+        x, temp_sup = exts[k]
+        extend_prefix(miner, prefix + (x,), temp_sup, bin_data & lst_bins[x], exts[k + 1:])
+
+
+def add_top_k(top, prefix, sup, bin_data, t_diffs):
+    # keep prefix if it is one of the k best patterns so far (False if it is below the
+    # threshold); once there are k of them, the threshold is the k-th best support
+    top_k, heap, order, min_sup = top
+    if sup <= min_sup:
+        return False
+    t_lag = None if t_diffs is None else calculate_time_lag(bin_data, t_diffs)
+    top[2] = order + 1
+    heapq.heappush(heap, (sup, -top[2], prefix, t_lag))
+    if len(heap) > top_k:
+        heapq.heappop(heap)
+    if len(heap) >= top_k:
+        top[3] = max(min_sup, heap[0][0])
+    return True
+
+
+def get_top_k(heap, t_diffs=None):
+    # patterns of the top-k heap: highest support first (ties: first found)
+    patterns = list()
+    for sup, _, prefix, t_lag in sorted(heap, reverse=True):
+        gp = get_gp(prefix, sup)
+        if t_diffs is None:
+            patterns.append(gp)
+        elif t_lag.valid:
+            patterns.append(TGP(gp=gp, t_lag=t_lag))
+    return patterns
+
+
+def get_gp(prefix, sup):
+    gp = GP()
+    for obj in prefix:
+        gp.add_gradual_item(GI(obj[0], obj[1].decode() if isinstance(obj[1], bytes) else obj[1]))
+    gp.set_support(sup)
+    return gp
@@ -8,76 +8,52 @@
 """
 
 import numpy as np
-import gc
 from ..fuzzy_mf import calculate_time_lag
 from .dataset_h5 import Dataset_h5
 from ..gp import GI, GP, TGP
+from ..graank_v2 import join_candidates, mine_dfs
 
 
 def inv(g_item):
     if g_item[1] == '+':
         temp = tuple([g_item[0], '-'])
+    elif g_item[1] == b'+':
+        temp = tuple([g_item[0], b'-'])
+    elif g_item[1] == b'-':
+        temp = tuple([g_item[0], b'+'])
     else:
         temp = tuple([g_item[0], '+'])
     return temp
 
 
+def is_canonical(item_set):
+    # a pattern and its inverse have the same support: only the one with
+    # '+' on its lowest attribute is generated ('+' wins a tie on that attribute)
+    g_item = min(item_set)
+    return g_item[1] == '+' or g_item[1] == b'+'
+
+
 def gen_apriori_candidates(R, sup, n, d_set):
     res = []
-    I = []
     if len(R) < 2:
         return []
-    try:
-        Ck = [{x[0]} for x in R]
-    except TypeError:
-        Ck = [set(x[0]) for x in R]
-
-    for i in range(len(R) - 1):
-        for j in range(i + 1, len(R)):
-            try:
-                R_i = {R[i][0]}
-                R_j = {R[j][0]}
-                R_o = {R[0][0]}
-            except TypeError:
-                R_i = set(R[i][0])
-                R_j = set(R[j][0])
-                R_o = set(R[0][0])
-            temp = R_i | R_j
-            invtemp = {inv(x) for x in temp}
-            if (len(temp) == len(R_o) + 1) and (not (I != [] and temp in I)) \
-                    and (not (I != [] and invtemp in I)):
-                test = 1
-                for k in temp:
-                    try:
-                        k_set = {k}
-                    except TypeError:
-                        k_set = set(k)
-                    temp2 = temp - k_set
-                    invtemp2 = {inv(x) for x in temp2}
-                    if not temp2 in Ck and not invtemp2 in Ck:
-                        test = 0
-                        break
-                if test == 1:
-                    if R[i][1] is None:
-                        # read from h5 file
-                        gi = GI(R[i][0][0], R[i][0][1])
-                        grp = 'dataset/' + d_set.step_name + '/valid_bins/' + gi.as_string()
-                        bin_data1 = d_set.read_h5_dataset(grp)
-                    else:
-                        bin_data1 = R[i][1]
-                    if R[j][1] is None:
-                        # read from h5 file
-                        gi = GI(R[j][0][0], R[j][0][1])
-                        grp = 'dataset/' + d_set.step_name + '/valid_bins/' + gi.as_string()
-                        bin_data2 = d_set.read_h5_dataset(grp)
-                    else:
-                        bin_data2 = R[j][1]
-                    m = bin_data1 * bin_data2
-                    t = float(np.sum(m)) / float(n * (n - 1.0) / 2.0)
-                    if t > sup:
-                        res.append([temp, m])
-                I.append(temp)
-                gc.collect()
+    for temp, i, j in join_candidates(R):
+        if R[i][1] is None:
+            # read from h5 file
+            gi = GI(R[i][0][0], R[i][0][1])
+            bin_data1 = d_set.read_valid_bin(gi)
+        else:
+            bin_data1 = R[i][1]
+        if R[j][1] is None:
+            # read from h5 file
+            gi = GI(R[j][0][0], R[j][0][1])
+            bin_data2 = d_set.read_valid_bin(gi)
+        else:
+            bin_data2 = R[j][1]
+        m = bin_data1 * bin_data2
+        t = float(np.sum(m)) / float(n * (n - 1.0) / 2.0)
+        if t > sup:
+            res.append([temp, m])
     return res
 
 
@@ -95,7 +71,7 @@ def gen_valid_bins(invalid_bins, attr_cols):
     return valid_gi
 
 
-def graank_h5(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None):
+def graank_h5(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None, num_cores=1):
     if d_set is None:
         d_set = Dataset_h5(f_path, min_sup, eq)
         d_set.init_attributes()
@@ -105,6 +81,12 @@ def graank_h5(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None):
     patterns = []
     n = d_set.attr_size
     lst_valid_gi = gen_valid_bins(d_set.invalid_bins, d_set.attr_cols)
+    if num_cores != 1:
+        # prefix classes mined in parallel over the (read-only) bins read from the h5 file
+        for obj in lst_valid_gi:
+            obj[1] = d_set.read_valid_bin(GI(obj[0][0], obj[0][1]))
+        patterns = mine_dfs(lst_valid_gi, n, min_sup, t_diffs, num_cores)
+        lst_valid_gi = []
 
     while len(lst_valid_gi) > 0:
         lst_valid_gi = gen_apriori_candidates(lst_valid_gi, min_sup, n, d_set)
@@ -119,8 +101,10 @@ def graank_h5(f_path=None, min_sup=None, eq=False, t_diffs=None, d_set=None):
                 del lst_valid_gi[i]
             else:
                 z = 0
-                while z < (len(patterns) - 1):
-                    if set(patterns[z].get_pattern()).issubset(set(gi_tuple)):
+                while z < len(patterns):
+                    # patterns are canonical: a sub-pattern may be stored as its inverse
+                    if set(patterns[z].get_pattern()).issubset(set(gi_tuple)) or \
+                            set(patterns[z].inv_pattern()).issubset(set(gi_tuple)):
                         del patterns[z]
                     else:
                         z = z + 1
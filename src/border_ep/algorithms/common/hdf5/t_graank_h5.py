@@ -13,7 +13,6 @@ Description: updated version that uses aco-graank and parallel multi-processing
 
 """
 
-import numpy as np
 from .dataset_h5 import Dataset_h5
 from ..t_graank import Tgrad
 from ..profile_cpu import Profile
@@ -34,10 +33,11 @@ class Tgrad_5(Tgrad):
             self.time_cols = cols
             self.min_sup = min_sup
             self.ref_item = ref_item
-            self.d_set.data = self.d_set.read_h5_dataset('dataset/data')
-            self.d_set.data = np.array(self.d_set.data).astype('U')
+            self.d_set.attr_data = self.d_set.read_h5_dataset('dataset/attr_data')
+            self.d_set.time_data = self.d_set.read_h5_dataset('dataset/time_data').astype('U')
+            self.d_set.time_stamps = self.d_set.read_h5_dataset('dataset/time_stamps')
             self.max_step = self.get_max_step(min_rep)
-            self.orig_attr_data = self.d_set.data.copy().T
+            self.orig_attr_data = self.d_set.attr_data
             if cores > 1:
                 self.cores = cores
             else:
@@ -48,6 +48,10 @@ class Tgrad_5(Tgrad):
             self.time_cols = []
             raise Exception('No date-time data found')
 
+    def get_valid_steps(self):
+        # bins are kept in the h5 file: the full (step 0) bins are not built to skip steps
+        return list(range(self.max_step))
+
     def fetch_patterns(self, step):
         step += 1  # because for-loop is not inclusive from range: 0 - max_step
         # 1. Transform data
@@ -61,3 +65,33 @@ class Tgrad_5(Tgrad):
         if len(tgps) > 0:
             return tgps
         return False
+
+    def transform_data(self, step):  # optimized
+        # NB: Restructure dataset based on reference item
+        time_diffs = self.check_transform(step)
+        ref_col = self.ref_item
+
+        # 1. Split the transpose data set into column-tuples
+        attr_data = self.orig_attr_data
+
+        # 2. Transform the data using (row) n+step
+        new_attr_data = list()
+        size = len(attr_data)
+        for k in range(size):
+            col_index = k
+            tuples = attr_data[k]
+            n = tuples.size
+            # temp_tuples = np.empty(n, )
+            # temp_tuples[:] = np.NaN
+            if col_index in self.time_cols:
+                # date-time attribute
+                temp_tuples = tuples[:]
+            elif col_index == ref_col:
+                # reference attribute
+                temp_tuples = tuples[0: n - step]
+            else:
+                # other attributes
+                temp_tuples = tuples[step: n]
+            # print(temp_tuples)
+            new_attr_data.append(temp_tuples)
+        return new_attr_data, time_diffs
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@credits: "Thomas Runkler, Edmond Menya, and Anne Laurent,"
+@license: "MIT"
+@version: "1.0"
+@email: "owuordickson@gmail.com"
+@created: "18 October 2026"
+
+Description: index of the winner (or loser) patterns of an ant colony
+
+A gradual item (col, symbol) is encoded as the integer 2 * col (+) or 2 * col + 1 (-) and a
+pattern as the bitmask of its items, so the inverse of an item is id ^ 1. Exact duplicates
+are found in a hash set of bitmasks; subset and superset queries walk a set-trie of the
+sorted item ids instead of scanning all the stored patterns.
+
+"""
+
+
+class PatternIndex:
+
+    def __init__(self):
+        self.patterns = list()
+        self.masks = set()
+        self.trie = SetTrie()
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def append(self, pattern):
+        items = PatternIndex.get_items(pattern)
+        self.patterns.append(pattern)
+        self.masks.add(PatternIndex.get_mask(items))
+        self.trie.insert(items)
+
+    def contains(self, pattern):
+        # pattern or its inverse is stored
+        items = PatternIndex.get_items(pattern)
+        inv_items = [item ^ 1 for item in items]
+        return (PatternIndex.get_mask(items) in self.masks) or (PatternIndex.get_mask(inv_items) in self.masks)
+
+    def has_subset(self, pattern):
+        # a stored pattern is a subset of pattern (or of its inverse)
+        items = PatternIndex.get_items(pattern)
+        inv_items = sorted([item ^ 1 for item in items])
+        return self.trie.has_subset(items) or self.trie.has_subset(inv_items)
+
+    def has_superset(self, pattern):
+        # a stored pattern is a superset of pattern (or of its inverse)
+        items = PatternIndex.get_items(pattern)
+        inv_items = sorted([item ^ 1 for item in items])
+        return self.trie.has_superset(items) or self.trie.has_superset(inv_items)
+
+    @staticmethod
+    def get_items(pattern):
+        items = set()
+        for gi in pattern.gradual_items:
+            symbol = gi.symbol.decode() if isinstance(gi.symbol, bytes) else gi.symbol
+            items.add(2 * int(gi.attribute_col) + (0 if symbol == '+' else 1))
+        return sorted(items)
+
+    @staticmethod
+    def get_mask(items):
+        mask = 0
+        for item in items:
+            mask |= (1 << item)
+        return mask
+
+
+class SetTrie:
+
+    def __init__(self):
+        self.children = dict()
+        self.is_end = False
+
+    def insert(self, items):
+        node = self
+        for item in items:
+            if item not in node.children:
+                node.children[item] = SetTrie()
+            node = node.children[item]
+        node.is_end = True
+
+    def has_subset(self, items, i=0):
+        # a stored set is a subset of items (sorted)
+        if self.is_end:
+            return True
+        for j in range(i, len(items)):
+            child = self.children.get(items[j])
+            if child is not None and child.has_subset(items, j + 1):
+                return True
+        return False
+
+    def has_superset(self, items, i=0):
+        # a stored set is a superset of items (sorted): every node leads to a stored set
+        if i >= len(items):
+            return True
+        for item, child in self.children.items():
+            if item < items[i]:
+                if child.has_superset(items, i):
+                    return True
+            elif item == items[i]:
+                if child.has_superset(items, i + 1):
+                    return True
+        return False
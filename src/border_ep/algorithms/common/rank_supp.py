@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@credits: "Anne Laurent"
+@license: "MIT"
+@version: "1.0"
+@email: "owuordickson@gmail.com"
+@created: "18 October 2026"
+
+Description: matrix-free (exact) support of gradual patterns
+
+A gradual item is a signed column y (y = x for '+' and y = -x for '-'). The pair of rows
+(i, j) is concordant with a pattern if y[j] < y[i] (y[j] <= y[i] when eq) for every item,
+which is exactly bin[i, j] of the AND of the item bins. The number of concordant pairs is
+a dominance count, found by divide and conquer on the columns (split at the median, count
+the cross pairs on the remaining columns) and a sorted search on the last column. This
+needs O(n log^k n) time and O(n k) memory instead of the n x n bins.
+
+"""
+
+import numpy as np
+
+
+LEAF_SIZE = 2 ** 16  # row pairs below which the pairs are compared directly
+
+
+class RankBin:
+
+    def __init__(self, y, equal=False):
+        self.y = y.reshape(y.shape[0], -1)
+        self.equal = equal
+
+    def __and__(self, other):
+        # AND of two bins: the items of both
+        return RankBin(np.column_stack((self.y, other.y)), self.equal)
+
+    def count(self):
+        # number of concordant pairs
+        return int(np.sum(self.get_counts(self.y)))
+
+    def get_indices(self):
+        # rows that belong to at least one concordant pair
+        counts = self.get_counts(self.y) + self.get_counts(-self.y)
+        return np.argwhere(counts > 0)
+
+    def get_counts(self, y):
+        # per row: the number of rows it dominates (rows with a nan are in no pair)
+        counts = np.zeros(y.shape[0], dtype=np.int64)
+        rows = np.flatnonzero(~np.any(np.isnan(y), axis=1))
+        if rows.size > 0:
+            counts[rows] = count_dominated(y[rows], self.equal)
+        return counts
+
+
+def count_dominated(y, equal=False):
+    counts = np.zeros(y.shape[0], dtype=np.int64)
+    rows = np.arange(y.shape[0])
+    add_dominated(y, rows, rows, 0, equal, counts)
+    if equal:
+        # (i, i) is not a pair
+        counts -= 1
+    return counts
+
+
+def add_dominated(y, p, q, d, equal, counts):
+    # counts[p] += number of rows in q that p dominates in columns d ... k-1
+    if p.size <= 0 or q.size <= 0:
+        return
+    k = y.shape[1]
+    if d == (k - 1):
+        q_col = np.sort(y[q, d])
+        counts[p] += np.searchsorted(q_col, y[p, d], side=('right' if equal else 'left'))
+        return
+    if (p.size * q.size) <= LEAF_SIZE:
+        y_p = y[p, d:][:, np.newaxis, :]
+        y_q = y[q, d:][np.newaxis, :, :]
+        if equal:
+            counts[p] += np.count_nonzero(np.all(y_q <= y_p, axis=2), axis=1)
+        else:
+            counts[p] += np.count_nonzero(np.all(y_q < y_p, axis=2), axis=1)
+        return
+    med = np.median(np.concatenate((y[p, d], y[q, d])))
+    p_lo, p_eq, p_hi = p[y[p, d] < med], p[y[p, d] == med], p[y[p, d] > med]
+    q_lo, q_eq, q_hi = q[y[q, d] < med], q[y[q, d] == med], q[y[q, d] > med]
+    # pairs on the same side of the median: column d is still open
+    add_dominated(y, p_lo, q_lo, d, equal, counts)
+    add_dominated(y, p_hi, q_hi, d, equal, counts)
+    # cross pairs: column d holds, count on the next columns
+    add_dominated(y, np.concatenate((p_eq, p_hi)), q_lo, d + 1, equal, counts)
+    add_dominated(y, p_hi, q_eq, d + 1, equal, counts)
+    if equal:
+        add_dominated(y, p_eq, q_eq, d + 1, equal, counts)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@credits: "Thomas Runkler, Edmond Menya, and Anne Laurent,"
+@license: "MIT"
+@version: "1.0"
+@email: "owuordickson@gmail.com"
+@created: "18 October 2026"
+
+Description: sparse bins of deep gradual patterns (a tidset of their concordant pairs)
+
+A deep pattern has few concordant pairs, so its bin is kept as the flat positions of its
+pairs in the item bins: i * n + j in a dense bin and direction * bits + k in a packed bin.
+Extending the pattern by an item tests these positions in the item bin only: its support
+is the support of the pattern minus the pairs that are lost. The bin of a pattern with
+several extensions to test is switched to a SparseBin once its positions take less memory
+than the bin.
+
+"""
+
+import numpy as np
+
+
+class SparseBin:
+
+    def __init__(self, pos, shape, packed=False):
+        self.pos = pos
+        self.shape = shape
+        self.packed = packed
+        self.inv_pos = None
+
+    def __and__(self, bin_data):
+        # SparseBin of the pattern extended by the item of bin_data: the pairs that are kept
+        return SparseBin(self.pos[self.get_bits(bin_data)], self.shape, self.packed)
+
+    @property
+    def nbytes(self):
+        return self.pos.nbytes
+
+    def count(self):
+        # number of concordant pairs
+        return int(self.pos.size)
+
+    def get_lost_count(self, bin_data):
+        # pairs of this pattern that are lost by an extension
+        return self.count() - int(np.count_nonzero(self.get_bits(bin_data)))
+
+    def get_bits(self, bin_data):
+        # bin_data at the pairs of this pattern
+        if bin_data.flags.c_contiguous:
+            pos = self.pos
+        else:
+            # '-' bin: a view of the '+' bin (transpose or swapped pair rows)
+            inv_data = bin_data[::-1] if self.packed else bin_data.T
+            if inv_data.flags.c_contiguous:
+                bin_data = inv_data
+                pos = self.get_inv_pos()
+            elif not self.packed:
+                # a block of a larger bin (temporal steps)
+                return bin_data[np.divmod(self.pos, self.shape[1])]
+            else:
+                bin_data = np.ascontiguousarray(bin_data)
+                pos = self.pos
+        if not self.packed:
+            return np.take(bin_data.reshape(-1), pos)
+        words = bin_data.reshape(-1).view(np.uint8)
+        # packbits order: the first pair is the highest bit of a byte
+        return ((np.take(words, pos >> 3) >> (7 - (pos & 7))) & 1).astype(bool)
+
+    def get_inv_pos(self):
+        # positions of the pairs in the '+' bin of a '-' view
+        if self.inv_pos is None:
+            if self.packed:
+                r, k = np.divmod(self.pos, self.shape[1])
+                self.inv_pos = (1 - r) * self.shape[1] + k
+            else:
+                i, j = np.divmod(self.pos, self.shape[1])
+                self.inv_pos = j * self.shape[1] + i
+        return self.inv_pos
+
+    def get_indices(self, n):
+        # (row, col) positions of the concordant pairs (see Dataset.get_bin_indices)
+        if not self.packed:
+            return np.column_stack(np.divmod(self.pos, self.shape[1]))
+        r, k = np.divmod(self.pos, self.shape[1])
+        offsets = np.arange(n) * n - (np.arange(n) * (np.arange(n) + 1) / 2).astype(int)
+        i = np.searchsorted(offsets, k, side='right') - 1
+        j = k - offsets[i] + i + 1
+        return np.column_stack((np.where(r == 0, i, j), np.where(r == 0, j, i)))
+
+    @staticmethod
+    def from_bin(bin_data):
+        # SparseBin of a dense or a packed bin
+        bin_data = np.ascontiguousarray(bin_data)
+        if bin_data.dtype != np.uint64:
+            return SparseBin(np.flatnonzero(bin_data), bin_data.shape)
+        bits = np.unpackbits(bin_data.view(np.uint8), axis=1)
+        return SparseBin(np.flatnonzero(bits), bits.shape, packed=True)
+
+    @staticmethod
+    def is_sparse(bin_data, count):
+        # the positions of the pairs of a dense or packed bin take less memory than the bin
+        if not isinstance(bin_data, np.ndarray):
+            return False
+        return (16 * count) < bin_data.nbytes
@@ -25,12 +25,11 @@ class T_Grad_gr(Tgrad):
 
     def fetch_patterns(self, step):
         step += 1  # because for-loop is not inclusive from range: 0 - max_step
-        # 1. Transform data
+        # 1. Transform data (bins are views of the full bins)
         d_set = self.d_set
-        attr_data, time_diffs = self.transform_data(step)
+        time_diffs = self.transform_bins(step)
 
         # 2. Execute t-graank for each transformation
-        d_set.update_attributes(attr_data)
         tgps = graank(t_diffs=time_diffs, d_set=d_set)
 
         if len(tgps) > 0:
@@ -8,13 +8,15 @@
 @modified: "02 June 2020"
 
 Usage:
-    $python3 init_trenc.py -f fileName.csv -c refCol -s minSup  -r minRep
+    $python3 init_trenc.py -f fileName.csv -c refCol -s minSup  -r minRep -e seed -k checkpointDir
 
 Description:
     f -> file path (CSV)
     c -> reference column
     s -> minimum support
     r -> representativity
+    e -> random seed (reproducible runs)
+    k -> directory of the pheromone checkpoints (warm start)
 
 """
 
@@ -22,14 +24,18 @@ import sys
 from optparse import OptionParser
 from trenc.algorithms.trenc_gp import Trenc_GP
 from trenc.algorithms.trenc_tgp import Trenc_TGP
+from trenc.algorithms.common.pheromone_store import PheromoneStore
 
 
-def init_trenc(paths, minSup, ref_item, ref_dset, cores, allow_para, minRep):
+def init_trenc(paths, minSup, ref_item, ref_dset, cores, allow_para, minRep, seed=None, cp_dir=None):
     try:
+        store = None
+        if cp_dir is not None:
+            store = PheromoneStore(cp_dir)
         if minRep == 0:
-            ep_set = Trenc_GP(paths, minSup, ref_dset, cores, allow_para)
+            ep_set = Trenc_GP(paths, minSup, ref_dset, cores, allow_para, seed, store)
         else:
-            ep_set = Trenc_TGP(paths, minSup, minRep, ref_item, ref_dset, cores, allow_para)
+            ep_set = Trenc_TGP(paths, minSup, minRep, ref_item, ref_dset, cores, allow_para, seed, store)
         gep_list = ep_set.run_trenc()
 
         wr_line = "Algorithm: TRENC \n"
@@ -46,6 +52,7 @@ def init_trenc(paths, minSup, ref_item, ref_dset, cores, allow_para, minRep):
         wr_line += "Minimum representativity: " + str(minRep) + '\n'
         wr_line += "Multi-core execution: " + str(ep_set.msg_para) + '\n'
         wr_line += "Number of cores: " + str(ep_set.cores) + '\n'
+        wr_line += "Random seed: " + str(seed) + '\n'
         wr_line += "Number of patterns: " + str(len(gep_list)) + '\n'
         wr_line += '\n\n'
 
@@ -97,6 +104,8 @@ if __name__ == "__main__":
         min_rep = sys.argv[4]
         allow_p = sys.argv[5]
         num_cores = 1
+        seed = None
+        cp_dir = None
     else:
         optparser = OptionParser()
         optparser.add_option('-f', '--inputFile',
@@ -139,6 +148,16 @@ if __name__ == "__main__":
                              help='number of cores',
                              default=0,
                              type='int')
+        optparser.add_option('-e', '--seed',
+                             dest='seed',
+                             help='random seed',
+                             default=None,
+                             type='int')
+        optparser.add_option('-k', '--checkpoints',
+                             dest='cpDir',
+                             help='directory of pheromone checkpoints',
+                             default=None,
+                             type='string')
         (options, args) = optparser.parse_args()
         inFile = None
         if options.file is None:
@@ -154,10 +173,12 @@ if __name__ == "__main__":
         ref_ds = options.refDset
         allow_p = options.allowPara
         num_cores = options.numCores
+        seed = options.seed
+        cp_dir = options.cpDir
 
     import time
     start = time.time()
-    res_text = init_trenc(file_path, min_sup, ref_col, ref_ds, num_cores, allow_p, min_rep)
+    res_text = init_trenc(file_path, min_sup, ref_col, ref_ds, num_cores, allow_p, min_rep, seed, cp_dir)
     end = time.time()
 
     wr_text = ("Run-time: " + str(end - start) + " seconds\n")
@@ -27,20 +27,20 @@ class GradACOgr(GradACO):
         self.sup_matrix = np.array([])
 
     def deposit_pheromone(self, pattern=GP()):
-        lst_attr = []
-        for obj in pattern.gradual_items:
-            # print(obj.attribute_col)
-            attr = obj.attribute_col
-            symbol = obj.symbol
-            lst_attr.append(attr)
-            i = attr
-            if symbol == '+':
-                self.p_matrix[i][0] += pattern.support
-                self.steps_matrix[i][0] += 1
-            elif symbol == '-':
-                self.p_matrix[i][1] += pattern.support
-                self.steps_matrix[i][1] += 1
-        for index in self.attr_index:
-            if int(index) not in lst_attr:
-                i = int(index)
-                self.p_matrix[i][2] += 1
+        rows, cols = self.pheromone.deposit(self.attr_index, pattern, pattern.support)
+        self.steps_matrix[rows, cols] += 1
+
+    def evaporate_pheromone(self):
+        # decay the deposit counts too: sup_matrix stays the (weighted) mean support
+        super().evaporate_pheromone()
+        self.steps_matrix = self.steps_matrix.astype(float)
+        self.steps_matrix[self.attr_index] *= (1 - self.e_factor)
+
+    def get_colony_state(self):
+        state = super().get_colony_state()
+        state['steps_matrix'] = self.steps_matrix.copy()
+        return state
+
+    def set_colony_state(self, state):
+        super().set_colony_state(state)
+        self.steps_matrix = state['steps_matrix']
@@ -17,7 +17,7 @@ import numpy as np
 from .aco_grad_gr import GradACOgr
 from .common.aco_tgrad import T_GradACO
 from .common.fuzzy_mf import calculate_time_lag
-from .common.gp import GP, TGP
+from .common.gp import TGP
 
 
 class GradACOt_gr (GradACOgr):
@@ -31,68 +31,42 @@ class GradACOt_gr (GradACOgr):
         self.sup_matrix = np.array([])
         self.tstamp_matrix = [[[] for i in range(3)] for j in range(d_set.column_size)]
         self.time_diffs = t_diffs
-        self.d_set.update_attributes(attr_data)
+        if attr_data is not None:
+            self.d_set.update_attributes(attr_data)
 
     def deposit_pheromone(self, pattern=TGP()):
-        lst_attr = []
-        for obj in pattern.gradual_items:
-            # print(obj.attribute_col)
-            attr = obj.attribute_col
-            symbol = obj.symbol
-            lst_attr.append(attr)
-            i = attr
-            if symbol == '+':
-                self.p_matrix[i][0] += pattern.support
-                self.steps_matrix[i][0] += 1
-                self.tstamp_matrix[i][0].append([pattern.time_lag.timestamp, pattern.time_lag.support])
-            elif symbol == '-':
-                self.p_matrix[i][1] += pattern.support
-                self.steps_matrix[i][1] += 1
-                self.tstamp_matrix[i][1].append([pattern.time_lag.timestamp, pattern.time_lag.support])
-        for index in self.attr_index:
-            if int(index) not in lst_attr:
-                i = int(index)
-                self.p_matrix[i][2] += 1
+        rows, cols = self.pheromone.deposit(self.attr_index, pattern, pattern.support)
+        self.steps_matrix[rows, cols] += 1
+        for i, j in zip(rows, cols):
+            self.tstamp_matrix[i][j].append([pattern.time_lag.timestamp, pattern.time_lag.support])
+
+    def get_colony_state(self):
+        state = super().get_colony_state()
+        state['tstamp_matrix'] = self.tstamp_matrix
+        return state
+
+    def set_colony_state(self, state):
+        super().set_colony_state(state)
+        self.tstamp_matrix = state['tstamp_matrix']
 
     def validate_gp(self, pattern):
         # pattern = [('2', '+'), ('4', '+')]
-        min_supp = self.d_set.thd_supp
-        gen_pattern = GP()
-        bin_data = np.array([])
-
-        for gi in pattern.gradual_items:
-            if self.d_set.invalid_bins.size > 0 and np.any(np.isin(self.d_set.invalid_bins, gi.gradual_item)):
-                continue
-            else:
-                arg = np.argwhere(np.isin(self.d_set.valid_bins[:, 0], gi.gradual_item))
-                if len(arg) > 0:
-                    i = arg[0][0]
-                    bin_obj = self.d_set.valid_bins[i]
-                    if bin_data.size <= 0:
-                        bin_data = np.array([bin_obj[1], bin_obj[1]])
-                        gen_pattern.add_gradual_item(gi)
-                    else:
-                        bin_data[1] = bin_obj[1]
-                        temp_bin, supp = self.bin_and(bin_data, self.d_set.attr_size)
-                        if supp >= min_supp:
-                            bin_data[0] = temp_bin
-                            gen_pattern.add_gradual_item(gi)
-                            gen_pattern.set_support(supp)
+        gen_pattern, bin_data = self.and_items(pattern)
         if len(gen_pattern.gradual_items) <= 1:
             tgp = TGP(gp=pattern)
             return tgp
         else:
             # t_lag = FuzzyMF.calculate_time_lag(FuzzyMF.get_patten_indices(bin_data[0]), t_diffs, min_supp)
-            t_lag = calculate_time_lag(bin_data[0], self.time_diffs)
+            t_lag = calculate_time_lag(bin_data, self.time_diffs)
             if t_lag.support <= 0:
                 gen_pattern.set_support(0)
-            tgp = TGP(gp=gen_pattern, t_lag=t_lag)
+            tgp = TGP(gp=gen_pattern.to_canonical(), t_lag=t_lag)
             return tgp
 
 
 class T_GradACOgr(T_GradACO):
 
-    def __init__(self, d_set, ref_item, min_rep, cores):
+    def __init__(self, d_set, ref_item, min_rep, cores, seed=None):
         # For tgraank
         self.d_set = d_set
         cols = self.d_set.time_cols
@@ -103,22 +77,26 @@ class T_GradACOgr(T_GradACO):
             self.min_sup = d_set.thd_supp
             self.ref_item = ref_item
             self.max_step = self.get_max_step(min_rep)
-            self.orig_attr_data = self.d_set.data.copy().T
             self.cores = cores
+            self.seed = seed
         else:
             print("Dataset Error")
             self.time_ok = False
             self.time_cols = []
             raise Exception('No date-time data found')
 
+    def get_valid_steps(self):
+        # every step: the support matrices of all the steps are compared (see Trenc_TGP)
+        return list(range(self.max_step))
+
     def fetch_patterns(self, step):
         step += 1  # because for-loop is not inclusive from range: 0 - max_step
-        # 1. Transform data
+        # 1. Transform data (bins are views of the full bins)
         d_set = self.d_set
-        attr_data, time_diffs = self.transform_data(step)
+        time_diffs = self.transform_bins(step)
 
         # 2. Execute aco-graank for each transformation
-        ac = GradACOt_gr(d_set, attr_data, time_diffs)
+        ac = self.init_colony(GradACOt_gr(d_set, None, time_diffs), step)
         list_gp = ac.run_ant_colony()
 
         # 3. Update Support Matrix
@@ -31,50 +31,39 @@ class GradACOt (GradACO):
         self.time_diffs = t_diffs
         self.attr_index = self.d_set.attr_cols
         self.p_matrix = np.ones((self.d_set.column_size, 3), dtype=float)
-        self.d_set.update_attributes(attr_data)
+        if attr_data is not None:
+            self.d_set.update_attributes(attr_data)
 
     def validate_gp(self, pattern):
         # pattern = [('2', '+'), ('4', '+')]
-        min_supp = self.d_set.thd_supp
-        gen_pattern = GP()
-        bin_data = np.array([])
-
-        for gi in pattern.gradual_items:
-            if self.d_set.invalid_bins.size > 0 and np.any(np.isin(self.d_set.invalid_bins, gi.gradual_item)):
-                continue
-            else:
-                arg = np.argwhere(np.isin(self.d_set.valid_bins[:, 0], gi.gradual_item))
-                if len(arg) > 0:
-                    i = arg[0][0]
-                    bin_obj = self.d_set.valid_bins[i]
-                    if bin_data.size <= 0:
-                        bin_data = np.array([bin_obj[1], bin_obj[1]])
-                        gen_pattern.add_gradual_item(gi)
-                    else:
-                        bin_data[1] = bin_obj[1]
-                        temp_bin, supp = self.bin_and(bin_data, self.d_set.attr_size)
-                        if supp >= min_supp:
-                            bin_data[0] = temp_bin
-                            gen_pattern.add_gradual_item(gi)
-                            gen_pattern.set_support(supp)
+        gen_pattern, bin_data = self.and_items(pattern)
         if len(gen_pattern.gradual_items) <= 1:
             tgp = TGP(gp=pattern)
             return tgp
         else:
             # t_lag = FuzzyMF.calculate_time_lag(FuzzyMF.get_patten_indices(bin_data[0]), t_diffs, min_supp)
-            t_lag = calculate_time_lag(bin_data[0], self.time_diffs)
+            t_lag = calculate_time_lag(bin_data, self.time_diffs)
             if t_lag.support <= 0:
                 gen_pattern.set_support(0)
-            tgp = TGP(gp=gen_pattern, t_lag=t_lag)
+            tgp = TGP(gp=gen_pattern.to_canonical(), t_lag=t_lag)
             return tgp
 
 
 class T_GradACO:
 
-    def __init__(self, f_path, eq, ref_item, min_sup, min_rep, cores):
+    budget = None  # GradACO.set_budget arguments of the colony of every step
+    seed = None  # seed of the colonies: step k uses the stream [seed, k]
+    store = None  # pheromone checkpoints of the colonies (tagged by step)
+    carry_steps = 0  # consecutive steps that carry pheromone and winners (0: independent steps)
+    carry_weight = 0.5  # weight of the carried pheromone
+    carry = None
+    cache_args = None  # GradACO.set_cache arguments of the colony of every step
+    use_pairs = False  # precompute the 2-item supports of every step (see GradACO.set_pairs)
+
+    def __init__(self, f_path, eq, ref_item, min_sup, min_rep, cores, packed=False, matrix_free=False, seed=None):
         # For tgraank
         # self.d_set = d_set
-        self.d_set = Dataset(f_path, min_sup=min_sup, eq=eq)
+        self.d_set = Dataset(f_path, min_sup=min_sup, eq=eq, packed=packed, matrix_free=matrix_free)
         cols = self.d_set.time_cols
         if len(cols) > 0:
             print("Dataset Ok")
@@ -83,19 +72,88 @@ class T_GradACO:
             self.min_sup = min_sup
             self.ref_item = ref_item
             self.max_step = self.get_max_step(min_rep)
-            self.orig_attr_data = self.d_set.data.copy().T
             self.cores = cores
+            self.seed = seed
         else:
             print("Dataset Error")
             self.time_ok = False
             self.time_cols = []
             raise Exception('No date-time data found')
 
+    def set_budget(self, max_time=0, max_ants=0, max_gens=0, max_repeat=None, max_stable=0, min_entropy=0,
+                   e_factor=0):
+        # budgets (and criteria) of the colony of every step, see GradACO.set_budget
+        self.budget = {'max_time': max_time, 'max_ants': max_ants, 'max_gens': max_gens,
+                       'max_repeat': max_repeat, 'max_stable': max_stable, 'min_entropy': min_entropy,
+                       'e_factor': e_factor}
+
+    def set_store(self, store):
+        self.store = store
+
+    def set_carry(self, carry_steps, carry_weight=0.5):
+        # the steps are mined in chunks of carry_steps (in parallel); inside a chunk the
+        # pheromone and the winners of step s seed step s+1
+        if carry_steps < 0:
+            raise Exception("Carry steps must not be negative")
+        self.carry_steps = carry_steps
+        self.carry_weight = carry_weight
+
+    def set_cache(self, max_size=1024, max_bytes=2 ** 28):
+        # every step has its own bins: one cache per colony
+        self.cache_args = (max_size, max_bytes)
+
+    def set_pairs(self, use_pairs=True):
+        self.use_pairs = use_pairs
+
+    def init_colony(self, ac, step):
+        # every step has its own random stream: results do not depend on the cores
+        ac.set_seed(T_GradACO.get_step_seed(self.seed, step))
+        if self.store is not None:
+            ac.set_store(self.store, tag=('step_' + str(step)))
+        if self.budget is not None:
+            ac.set_budget(**self.budget)
+        if self.cache_args is not None:
+            ac.set_cache(*self.cache_args)
+        if self.use_pairs:
+            ac.set_pairs()
+        if self.carry is not None:
+            if self.carry[0] is not None:
+                ac.set_prior(self.carry[1], self.carry[2])
+            self.carry[0] = ac
+        return ac
+
+    def fetch_chunk(self, steps):
+        # consecutive steps: every colony seeds the next one
+        self.carry = [None, None, ()]
+        patterns = list()
+        for step in steps:
+            patterns.append(self.fetch_patterns(step))
+            ac = self.carry[0]
+            p_prior = ac.p_matrix - 1
+            if ac.p_prior is not None:
+                p_prior = p_prior + ac.p_prior
+            init_gps = list()
+            for pattern in ac.winner_gps:
+                gp = GP()
+                for gi in pattern.gradual_items:
+                    gp.add_gradual_item(gi)
+                init_gps.append(gp)
+            self.carry = [ac, self.carry_weight * p_prior, init_gps]
+        self.carry = None
+        return patterns
+
+    @staticmethod
+    def get_step_seed(seed, step):
+        if seed is None:
+            return None
+        return [seed, step]
+
     def get_max_step(self, min_rep):  # optimized
-        all_rows = len(self.d_set.data)
+        all_rows = self.d_set.size
         return all_rows - int(min_rep * all_rows)
 
     def run_tgraank(self, parallel=False):
+        global shared_t_colony
         if parallel:
             # implement parallel multi-processing
             if self.cores > 1:
@@ -105,29 +163,45 @@ class T_GradACO:
                 self.cores = num_cores
 
             self.cores = num_cores
-            steps = range(self.max_step)
+            steps = self.get_valid_steps()
+            # forked workers inherit this instance (and its full bins): it is not pickled
+            aco = None if (mp.get_start_method() == 'fork') else self
+            shared_t_colony = self
             # pool = mp.Pool(num_cores)
             with mp.Pool(num_cores) as pool:
-                patterns = pool.map(self.fetch_patterns, steps)
+                if self.carry_steps > 0:
+                    chunks = pool.map(fetch_step_chunk, [(aco, chunk) for chunk in self.get_chunks()])
+                    patterns = [t_pattern for chunk in chunks for t_pattern in chunk]
+                else:
+                    patterns = pool.map(fetch_step, [(aco, step) for step in steps])
                 # pool.close()
                 # pool.join()
+            shared_t_colony = None
             return patterns
         else:
             patterns = list()
-            for step in range(self.max_step):
-                t_pattern = self.fetch_patterns(step)
+            if self.carry_steps > 0:
+                lst_patterns = [t_pattern for chunk in self.get_chunks() for t_pattern in self.fetch_chunk(chunk)]
+            else:
+                lst_patterns = (self.fetch_patterns(step) for step in self.get_valid_steps())
+            for t_pattern in lst_patterns:
                 if t_pattern:
                     patterns.append(t_pattern)
             return patterns
 
+    def get_chunks(self):
+        # consecutive mined steps (see get_valid_steps)
+        steps = self.get_valid_steps()
+        return [steps[i: i + self.carry_steps] for i in range(0, len(steps), self.carry_steps)]
+
     def fetch_patterns(self, step):
         step += 1  # because for-loop is not inclusive from range: 0 - max_step
-        # 1. Transform data
+        # 1. Transform data (bins are views of the full bins)
         d_set = self.d_set
-        attr_data, time_diffs = self.transform_data(step)
+        time_diffs = self.transform_bins(step)
 
         # 2. Execute aco-graank for each transformation
-        ac = GradACOt(d_set, attr_data, time_diffs)
+        ac = self.init_colony(GradACOt(d_set, None, time_diffs), step)
         list_gp = ac.run_ant_colony()
         # print("\nPheromone Matrix")
         # print(ac.p_matrix)
@@ -135,8 +209,21 @@ class T_GradACO:
             return list_gp
         return False
 
-    def transform_data(self, step):  # optimized
-        # NB: Restructure dataset based on reference item
+    def get_step_supports(self, pattern):
+        # support of pattern for every step (1 ... max_step) without mining each step
+        return self.d_set.get_step_supports(pattern, self.ref_item, self.max_step)
+
+    def get_valid_steps(self):
+        # steps with at least one frequent pair (see Dataset.get_valid_steps)
+        return self.d_set.get_valid_steps(self.ref_item, self.max_step, self.min_sup)
+
+    def transform_bins(self, step):  # optimized
+        # NB: bins of the transformed data are views of the full (step 0) bins
+        time_diffs = self.check_transform(step)
+        self.d_set.update_step_bins(step, self.ref_item)
+        return time_diffs
+
+    def check_transform(self, step):
         if self.time_ok:
             # 1. Calculate time difference using step
             ok, time_diffs = self.get_time_diffs(step)
@@ -149,55 +236,34 @@ class T_GradACO:
                 if ref_col in self.time_cols:
                     msg = "Reference column is a 'date-time' attribute"
                     raise Exception(msg)
-                elif (ref_col < 0) or (ref_col >= len(self.d_set.title)):
+                elif (ref_col < 0) or (ref_col >= self.d_set.column_size):
                     msg = "Reference column does not exist\nselect column between: " \
-                          "0 and " + str(len(self.d_set.title) - 1)
+                          "0 and " + str(self.d_set.column_size - 1)
                     raise Exception(msg)
                 else:
-                    # 1. Split the transpose data set into column-tuples
-                    attr_data = self.orig_attr_data
-
-                    # 2. Transform the data using (row) n+step
-                    new_attr_data = list()
-                    size = len(attr_data)
-                    for k in range(size):
-                        col_index = k
-                        tuples = attr_data[k]
-                        n = tuples.size
-                        # temp_tuples = np.empty(n, )
-                        # temp_tuples[:] = np.NaN
-                        if col_index in self.time_cols:
-                            # date-time attribute
-                            temp_tuples = tuples[:]
-                        elif col_index == ref_col:
-                            # reference attribute
-                            temp_tuples = tuples[0: n - step]
-                        else:
-                            # other attributes
-                            temp_tuples = tuples[step: n]
-                        # print(temp_tuples)
-                        new_attr_data.append(temp_tuples)
-                    return new_attr_data, time_diffs
+                    return time_diffs
         else:
             msg = "Fatal Error: Time format in column could not be processed"
             raise Exception(msg)
 
     def get_time_diffs(self, step):  # optimized
-        data = self.d_set.data
-        size = len(data)
-        time_diffs = []
-        for i in range(size):
-            if i < (size - step):
-                # for col in self.time_cols:
-                col = self.time_cols[0]  # use only the first date-time value
-                temp_1 = str(data[i][int(col)])
-                temp_2 = str(data[i + step][int(col)])
-                stamp_1 = Dataset.get_timestamp(temp_1)
-                stamp_2 = Dataset.get_timestamp(temp_2)
-                if (not stamp_1) or (not stamp_2):
-                    return False, [i + 1, i + step + 1]
-                time_diff = (stamp_2 - stamp_1)
-                # index = tuple([i, i + step])
-                # time_diffs.append([time_diff, index])
-                time_diffs.append([time_diff, i])
-        return True, np.array(time_diffs)
+        return self.d_set.get_time_diffs(step)
+
+
+shared_t_colony = None  # T_GradACO instance of the pool of steps (inherited by forked workers)
+
+
+def fetch_step(args):
+    # colony of one step, from the instance inherited by the worker
+    aco, step = args
+    if aco is None:
+        aco = shared_t_colony
+    return aco.fetch_patterns(step)
+
+
+def fetch_step_chunk(args):
+    # colonies of consecutive steps (see T_GradACO.fetch_chunk)
+    aco, steps = args
+    if aco is None:
+        aco = shared_t_colony
+    return aco.fetch_chunk(steps)
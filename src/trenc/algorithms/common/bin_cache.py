@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@credits: "Thomas Runkler, Edmond Menya, and Anne Laurent,"
+@license: "MIT"
+@version: "1.0"
+@email: "owuordickson@gmail.com"
+@created: "18 October 2026"
+
+Description: LRU cache of the partial AND bins of validate_gp
+
+A partial AND is keyed by its (sorted) gradual items, each encoded as 2 * col (+) or
+2 * col + 1 (-): ants that share items reuse the bin and the support instead of ANDing
+them again. The cache is bounded by the number of entries and by the bytes of the bins;
+the least recently used entries are evicted first.
+
+"""
+
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class BinCache:
+
+    def __init__(self, max_size=1024, max_bytes=2 ** 28):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.num_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        # (bin, support) of the items in key, None if it is not cached
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, bin_data, supp):
+        size = bin_data.nbytes if isinstance(bin_data, np.ndarray) else 0
+        if (size > self.max_bytes) or (self.max_size <= 0):
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = (bin_data, supp)
+            self.num_bytes += size
+            while (len(self.entries) > self.max_size) or (self.num_bytes > self.max_bytes):
+                _, (old_bin, _) = self.entries.popitem(last=False)
+                self.num_bytes -= old_bin.nbytes if isinstance(old_bin, np.ndarray) else 0
+
+    def get_hit_rate(self):
+        total = self.hits + self.misses
+        if total <= 0:
+            return 0
+        return self.hits / total
+
+    @staticmethod
+    def get_key(key, gi):
+        # key of the items in key and gi
+        return tuple(sorted(key + (BinCache.get_item(gi),)))
+
+    @staticmethod
+    def get_item(gi):
+        symbol = gi.symbol.decode() if isinstance(gi.symbol, bytes) else gi.symbol
+        return 2 * int(gi.attribute_col) + (0 if symbol == '+' else 1)
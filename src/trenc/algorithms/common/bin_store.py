@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@credits: "Anne Laurent"
+@license: "MIT"
+@version: "1.0"
+@email: "owuordickson@gmail.com"
+@created: "18 October 2026"
+
+Description: indexed store of the valid bins of a data set
+
+Only the '+' bin of every valid attribute is stored: in one contiguous (attrs x ...) tensor
+when the bins are arrays of the same shape, otherwise in a list (views of the full bins or
+matrix-free bins). The '-' bin is derived from the '+' bin (inv_bin). A table maps every
+attribute column to its slot in O(1), -1 for invalid attributes.
+
+"""
+
+import numpy as np
+from .rank_supp import RankBin
+
+
+class BinStore:
+
+    def __init__(self, cols, bins, column_size):
+        self.cols = np.array(cols, dtype=int)
+        self.bins = bins
+        self.slots = np.full(column_size, -1, dtype=int)
+        self.slots[self.cols] = np.arange(self.cols.size)
+
+    def get_slot(self, col):
+        return self.slots[int(col)]
+
+    def get_bin(self, col, symbol):
+        # bin of gradual item (col, symbol), None if the item is invalid
+        slot = self.slots[int(col)]
+        if slot < 0:
+            return None
+        if symbol == '+' or symbol == b'+':
+            return self.bins[slot]
+        return inv_bin(self.bins[slot])
+
+    def gather(self, items):
+        # bins of several gradual items [(col, symbol), ...] at once (all items must be valid)
+        slots = self.slots[np.array([int(col) for col, _ in items], dtype=int)]
+        neg = np.array([(symbol == '-' or symbol == b'-') for _, symbol in items], dtype=bool)
+        if not isinstance(self.bins, np.ndarray):
+            return [inv_bin(self.bins[s]) if is_neg else self.bins[s] for s, is_neg in zip(slots, neg)]
+        temp_bins = self.bins[slots]
+        if np.any(neg):
+            if temp_bins.dtype == np.uint64:
+                temp_bins[neg] = temp_bins[neg][:, ::-1]
+            else:
+                temp_bins[neg] = np.transpose(temp_bins[neg], (0, 2, 1))
+        return temp_bins
+
+    def get_valid_bins(self):
+        # object array of [gradual item, bin] pairs: (col, '+') and (col, '-') of every slot
+        valid_bins = np.empty((2 * self.cols.size, 2), dtype=object)
+        for i in range(self.cols.size):
+            col = self.cols[i]
+            valid_bins[2 * i, 0] = np.array((col, '+'), dtype='i, S1').tolist()
+            valid_bins[2 * i, 1] = self.bins[i]
+            valid_bins[2 * i + 1, 0] = np.array((col, '-'), dtype='i, S1').tolist()
+            valid_bins[2 * i + 1, 1] = inv_bin(self.bins[i])
+        return valid_bins
+
+
+def inv_bin(bin_data):
+    # bin of the inverse gradual item (a view for dense and packed bins)
+    if isinstance(bin_data, RankBin):
+        return RankBin(-bin_data.y, bin_data.equal)
+    if bin_data.dtype == np.uint64:
+        # packed pair rows: swap the 2 comparison directions
+        return bin_data[::-1]
+    return bin_data.T
@@ -14,107 +14,105 @@ Changes
    - this frees primary memory from storing nxn matrices
 2. Fetch all binaries during initialization
 3. Replaced loops for fetching binary rank with numpy function
+4. Parse numeric csv columns once into a typed columnar store (attr_data)
+5. Parse the date-time column once into int64 epoch stamps (time_stamps)
+6. Serve bins of temporal steps as views of the full bins (update_step_bins)
+7. Compute the support of a pattern for all the steps at once (get_step_supports)
+8. Optional bit-packed bins (packed=True): 64 pairs per uint64 word, supports counted by popcount
+9. One bin per attribute: the '-' bin is a view of the '+' bin (transpose or swapped pair rows)
+10. Optional matrix-free bins (matrix_free=True): exact supports by dominance counting (RankBin)
+11. 1-item supports from tie counts: bins of invalid columns are never built (count_rank_pairs)
+12. Indexed bin store (BinStore): contiguous '+' bins with O(1) lookup by column
+13. Sparse bins of deep patterns (SparseBin): counted and indexed like the other bins
 
 """
 import csv
+from array import array
+from datetime import datetime
 from dateutil.parser import parse
 import time
 import numpy as np
 import gc
+from .step_supp import get_step_supports
+from .rank_supp import RankBin
+from .sparse_bin import SparseBin
+from .bin_store import BinStore
+from .gp import GI, GP
+
+
+NAT_STAMP = np.iinfo(np.int64).min  # epoch value of an invalid date-time
+TIME_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d',
+                '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y', '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M',
+                '%m/%d/%Y', '%d-%m-%Y %H:%M:%S', '%d-%m-%Y', '%d.%m.%Y %H:%M:%S', '%d.%m.%Y',
+                '%H:%M:%S', '%H:%M']
 
 
 class Dataset:
 
-    def __init__(self, file_path, min_sup=0, eq=False):
-        data = Dataset.read_csv(file_path)
-        if len(data) <= 1:
-            self.data = np.array([])
-            data = None
+    def __init__(self, file_path, min_sup=0, eq=False, dtype=np.float64, packed=False, matrix_free=False):
+        self.title, self.time_cols, self.attr_data, self.time_data = Dataset.read_csv(file_path, dtype)
+        if self.attr_data.shape[1] < 2:
+            self.attr_data = np.array([])
             print("csv file read error")
             raise Exception("Unable to read csv file or file has no data")
         else:
             print("Data fetched from csv file")
-            self.data = np.array([])
-            self.title = self.get_title(data)  # optimized (numpy)
-            self.time_cols = self.get_time_cols()  # optimized (numpy)
             self.attr_cols = self.get_attributes()  # optimized (numpy)
             self.column_size = self.get_attribute_no()  # optimized (numpy)
             self.size = self.get_size()  # optimized (numpy)
+            self.time_stamps = self.get_time_stamps()  # optimized (numpy)
             self.attr_size = 0
             self.step_name = ''
             self.thd_supp = min_sup
             self.equal = eq
+            self.packed = packed
+            self.matrix_free = matrix_free
             self.invalid_bins = np.array([])
             self.valid_bins = np.array([])
-            data = None
+            self.bin_store = None
+            self.full_bins = None
             # self.init_attributes()
 
     def get_size(self):
-        size = self.data.shape[0]
+        size = self.attr_data.shape[1]
         return size
 
     def get_attribute_no(self):
-        count = self.data.shape[1]
+        count = self.attr_data.shape[0]
         return count
 
-    def get_title(self, data):
-        # data = self.raw_data
-        if data[0][0].replace('.', '', 1).isdigit() or data[0][0].isdigit():
-            title = self.convert_data_to_array(data)
-            return title
-        else:
-            if data[0][1].replace('.', '', 1).isdigit() or data[0][1].isdigit():
-                title = self.convert_data_to_array(data)
-                return title
-            else:
-                title = self.convert_data_to_array(data, has_title=True)
-                return title
-
-    def convert_data_to_array(self, data, has_title=False):
-        # convert csv data into array
-        title = np.array([])
-        if has_title:
-            keys = np.arange(len(data[0]))
-            values = np.array(data[0], dtype='S')
-            title = np.rec.fromarrays((keys, values), names=('key', 'value'))
-            data = np.delete(data, 0, 0)
-        # convert csv data into array
-        self.data = np.asarray(data)
-        return title
-
     def get_attributes(self):
         all_cols = np.arange(self.get_attribute_no())
         # attr_cols = np.delete(all_cols, self.time_cols)
         attr_cols = np.setdiff1d(all_cols, self.time_cols)
         return attr_cols
 
-    def get_time_cols(self):
-        time_cols = list()
-        # for k in range(10, len(self.data[0])):
-        #    time_cols.append(k)
-        # time_cols.append(0)
-        n = len(self.data[0])
-        for i in range(n):  # check every column for time format
-            row_data = str(self.data[0][i])
-            try:
-                time_ok, t_stamp = Dataset.test_time(row_data)
-                if time_ok:
-                    time_cols.append(i)
-            except ValueError:
-                continue
-        if len(time_cols) > 0:
-            return np.array(time_cols)
+    def get_time_stamps(self):
+        if len(self.time_cols) > 0:
+            # use only the first date-time value
+            return Dataset.parse_timestamps(self.time_data[0])
         else:
-            return np.array([])
+            return np.array([], dtype=np.int64)
+
+    def get_time_diffs(self, step):  # optimized
+        stamps = self.time_stamps
+        size = stamps.size
+        stamps_1 = stamps[0: size - step]
+        stamps_2 = stamps[step: size]
+        invalid = (stamps_1 == NAT_STAMP) | (stamps_2 == NAT_STAMP)
+        if np.any(invalid):
+            i = int(np.argmax(invalid))
+            return False, [i + 1, i + step + 1]
+        time_diffs = np.column_stack((stamps_2 - stamps_1, np.arange(size - step)))
+        return True, time_diffs.astype(float)
 
     def init_attributes(self):
         # (check) implement parallel multiprocessing
-        # transpose csv array data
-        attr_data = self.data.copy().T
+        # csv data is already stored column-wise
+        attr_data = self.attr_data
         self.attr_size = len(attr_data[self.attr_cols[0]])
         # construct and store 1-item_set valid bins
         self.construct_bins(attr_data)
-        attr_data = None
         gc.collect()
 
     def update_attributes(self, attr_data):
@@ -123,30 +121,173 @@ class Dataset:
         self.construct_bins(attr_data)
         gc.collect()
 
+    def init_full_bins(self):
+        if self.full_bins is None:
+            lst_data = [self.attr_data[col] for col in self.attr_cols]
+            self.full_bins = self.rank_cols(lst_data, packed=False, matrix_free=False)
+
+    def get_full_bin(self, gi):
+        self.init_full_bins()
+        i = np.argwhere(self.attr_cols == gi.attribute_col)[0][0]
+        if gi.symbol == '+':
+            return self.full_bins[i]
+        else:
+            return self.full_bins[i].T
+
+    def update_step_bins(self, step, ref_col):
+        # bins of the data transformed by step are sub-blocks of the full
+        # (step 0) bins: ref column -> full[:n-step, :n-step]; others -> full[step:, step:]
+        n = self.size - step
+        self.attr_size = n
+        step_data = dict()
+        for col in self.attr_cols:
+            if col == ref_col:
+                step_data[col] = self.attr_data[col][0: n]
+            else:
+                step_data[col] = self.attr_data[col][step: step + n]
+        cols = [col for col in self.attr_cols if self.is_valid_col(step_data[col])]
+        if self.packed or self.matrix_free:
+            # packed rows cannot be sliced by column: rank the shifted columns instead
+            bins = self.rank_cols([step_data[col] for col in cols])
+            self.set_bins(cols, bins)
+            return
+        self.init_full_bins()
+        bins = list()
+        for col in cols:
+            i = np.argwhere(self.attr_cols == col)[0][0]
+            if col == ref_col:
+                bins.append(self.full_bins[i][0: n, 0: n])
+            else:
+                bins.append(self.full_bins[i][step: step + n, step: step + n])
+        self.set_bins(cols, bins)
+
+    def get_step_supports(self, pattern, ref_col, max_step):
+        # support of pattern for every step: 1 ... max_step
+        if self.matrix_free:
+            return self.get_step_supports_free(pattern, ref_col, max_step)
+        ref_bin = None
+        bin_data = None
+        for gi in pattern.gradual_items:
+            temp_bin = self.get_full_bin(gi)
+            if gi.attribute_col == ref_col:
+                ref_bin = temp_bin
+            elif bin_data is None:
+                bin_data = temp_bin
+            else:
+                bin_data = bin_data * temp_bin
+        if bin_data is None:
+            # only the reference item: sum over R[:n-s, :n-s]
+            return get_step_supports(None, ref_bin[::-1, ::-1], max_step)
+        return get_step_supports(ref_bin, bin_data, max_step)
+
+    def get_valid_steps(self, ref_col, max_step, min_sup):
+        # steps (0 ... max_step - 1) with at least one frequent pair of gradual items:
+        # every pattern of a step is a superset of such a pair, so the other steps are
+        # not mined. The supports of a pair for all the steps come from one pass over the
+        # dense full bins: packed and matrix-free data sets keep all the steps
+        if self.packed or self.matrix_free:
+            return list(range(max_step))
+        valid = None
+        cols = self.attr_cols
+        for a in range(len(cols)):
+            for b in range(a + 1, len(cols)):
+                for symbol in ['+', '-']:
+                    gp = GP()
+                    gp.add_gradual_item(GI(cols[a], '+'))
+                    gp.add_gradual_item(GI(cols[b], symbol))
+                    temp = self.get_step_supports(gp, ref_col, max_step) >= min_sup
+                    valid = temp if valid is None else (valid | temp)
+        if valid is None:
+            return list()
+        return [step for step in range(max_step) if valid[step]]
+
+    def get_step_supports_free(self, pattern, ref_col, max_step):
+        supports = np.zeros(max_step)
+        for step in range(1, max_step + 1):
+            n = self.size - step
+            y = list()
+            for gi in pattern.gradual_items:
+                if gi.attribute_col == ref_col:
+                    col_data = self.attr_data[gi.attribute_col][0: n]
+                else:
+                    col_data = self.attr_data[gi.attribute_col][step: step + n]
+                y.append(col_data if gi.symbol == '+' else -col_data)
+            if n > 1:
+                count = RankBin(np.column_stack(y), self.equal).count()
+                supports[step - 1] = float(count) / float(n * (n - 1.0) / 2.0)
+        return supports
+
     def construct_bins(self, attr_data):
         # execute binary rank to calculate support of pattern
-        # valid_bins = list()  # numpy is very slow for append operations
-        n = self.attr_size
-        valid_bins = list()
+        # (1-item supports come from the tie counts: invalid columns are never ranked)
+        cols = [col for col in self.attr_cols if self.is_valid_col(attr_data[col])]
+        bins = self.rank_cols([attr_data[col] for col in cols])
+        self.set_bins(cols, bins)
+
+    def is_valid_col(self, col_data):
+        # 1-item support of a column (from its tie counts) against the threshold
+        n = len(col_data)
+        supp = float(Dataset.count_rank_pairs(col_data, self.equal)) / float(n * (n - 1.0) / 2.0)
+        return supp >= self.thd_supp
+
+    def rank_cols(self, lst_data, packed=None, matrix_free=None):
+        # '+' bins of the columns: one contiguous (cols x ...) tensor, or a list of matrix-free bins
+        # (the '-' bin of a column is derived from its '+' bin, see bin_store.inv_bin)
+        packed = self.packed if packed is None else packed
+        matrix_free = self.matrix_free if matrix_free is None else matrix_free
+        if matrix_free:
+            return [RankBin(Dataset.as_float(col_data), self.equal) for col_data in lst_data]
+        bins = None
+        for i in range(len(lst_data)):
+            temp_pos = Dataset.bin_rank(Dataset.as_float(lst_data[i]), equal=self.equal, packed=packed)
+            if bins is None:
+                bins = np.empty((len(lst_data),) + temp_pos.shape, dtype=temp_pos.dtype)
+            bins[i] = temp_pos
+        return bins if bins is not None else list()
+
+    def set_bins(self, cols, bins):
+        # cols: valid attribute columns, bins: their '+' bins
+        self.bin_store = BinStore(cols, bins, self.column_size)
+        # object array of [gradual item, bin] pairs (used by graank)
+        self.valid_bins = self.bin_store.get_valid_bins()
         invalid_bins = list()
         for col in self.attr_cols:
-            col_data = np.array(attr_data[col], dtype=float)
-            incr = np.array((col, '+'), dtype='i, S1')
-            decr = np.array((col, '-'), dtype='i, S1')
-            temp_pos = Dataset.bin_rank(col_data, equal=self.equal)
-            supp = float(np.sum(temp_pos)) / float(n * (n - 1.0) / 2.0)
-
-            if supp < self.thd_supp:
-                invalid_bins.append(incr)
-                invalid_bins.append(decr)
-            else:
-                valid_bins.append(np.array([incr.tolist(), temp_pos]))
-                valid_bins.append(np.array([decr.tolist(), temp_pos.T]))
-        self.valid_bins = np.array(valid_bins)
+            if self.bin_store.get_slot(col) < 0:
+                invalid_bins.append(np.array((col, '+'), dtype='i, S1'))
+                invalid_bins.append(np.array((col, '-'), dtype='i, S1'))
         self.invalid_bins = np.array(invalid_bins)
 
+    def get_bin(self, gi):
+        # O(1) bin of a gradual item, None if it is invalid
+        return self.bin_store.get_bin(gi.attribute_col, gi.symbol)
+
+    def get_valid_size(self):
+        # number of valid gradual items (one bin each)
+        return len(self.valid_bins)
+
     @staticmethod
-    def bin_rank(arr, equal=False):
+    def as_float(arr):
+        # typed columns keep their stored dtype (float32 or float64): they are not copied
+        arr = np.asarray(arr)
+        return arr if arr.dtype.kind == 'f' else arr.astype(float)
+
+    @staticmethod
+    def count_rank_pairs(arr, equal=False):
+        # number of concordant pairs of bin_rank(arr) in O(n log n): every pair of
+        # (non-nan) values is concordant except tied pairs (counted twice if equal)
+        arr = Dataset.as_float(arr)
+        values = arr[~np.isnan(arr)]
+        m = values.size
+        ties = np.unique(values, return_counts=True)[1].astype(np.int64)
+        tied = int(np.sum(ties * (ties - 1) // 2))
+        if equal:
+            return int(m * (m - 1) // 2) + tied
+        return int(m * (m - 1) // 2) - tied
+
+    @staticmethod
+    def bin_rank(arr, equal=False, packed=False):
+        if packed:
+            return Dataset.bin_rank_packed(arr, equal)
         with np.errstate(invalid='ignore'):
             if not equal:
                 temp_pos = arr < arr[:, np.newaxis]
@@ -156,15 +297,186 @@ class Dataset:
             return temp_pos
 
     @staticmethod
-    def read_csv(file):
-        # 1. retrieve data-set from file
+    def bin_rank_packed(arr, equal=False, chunk_size=2 ** 22):
+        # the n(n-1)/2 row pairs (i < j) of bin_rank as 2 bit-packed uint64 rows:
+        # [0] -> arr[j] < arr[i] (bin[i, j]) and [1] -> arr[i] < arr[j] (bin[j, i]);
+        # the decreasing bin is the same array with its rows swapped (a view).
+        # Built in row chunks so that the dense n x n matrix never exists
+        n = arr.size
+        m = int(n * (n - 1) / 2)
+        temp_bin = np.zeros((2, int(np.ceil(m / 64.0)) * 8), dtype=np.uint8)
+        step = max(1, int(chunk_size / max(n, 1)))
+        cols = np.arange(n)
+        carry = np.zeros((2, 0), dtype=bool)
+        pos = 0
+        with np.errstate(invalid='ignore'):
+            for i in range(0, n, step):
+                rows = arr[i: i + step, np.newaxis]
+                upper = cols > np.arange(i, i + rows.shape[0])[:, np.newaxis]
+                if not equal:
+                    fwd = (arr < rows)[upper]
+                    bwd = (arr > rows)[upper]
+                else:
+                    fwd = (arr <= rows)[upper]
+                    bwd = (arr >= rows)[upper]
+                bits = np.concatenate((carry, np.vstack((fwd, bwd))), axis=1)
+                # pack whole bytes only, the remaining bits go to the next chunk
+                k = bits.shape[1] if (i + step) >= n else int(bits.shape[1] / 8) * 8
+                packed = np.packbits(bits[:, 0: k], axis=1)
+                temp_bin[:, pos: pos + packed.shape[1]] = packed
+                pos += packed.shape[1]
+                carry = bits[:, k:]
+        return temp_bin.view(np.uint64)
+
+    @staticmethod
+    def get_pair_indices(bits, n):
+        # (i, j) rows of the set positions of an upper-triangle bit vector (i < j)
+        k = np.flatnonzero(bits)
+        offsets = np.arange(n) * n - (np.arange(n) * (np.arange(n) + 1) / 2).astype(int)
+        i = np.searchsorted(offsets, k, side='right') - 1
+        j = k - offsets[i] + i + 1
+        return i, j
+
+    @staticmethod
+    def get_bin_indices(bin_data, n):
+        # (row, col) positions of the concordant pairs of a dense or a packed bin
+        if isinstance(bin_data, SparseBin):
+            return bin_data.get_indices(n)
+        if isinstance(bin_data, RankBin):
+            # matrix-free: only the rows of the pairs
+            return bin_data.get_indices()
+        if bin_data.dtype != np.uint64:
+            return np.argwhere(bin_data == 1)
+        m = int(n * (n - 1) / 2)
+        bits = np.unpackbits(np.ascontiguousarray(bin_data).view(np.uint8), axis=1, count=m)
+        i_fwd, j_fwd = Dataset.get_pair_indices(bits[0], n)
+        i_bwd, j_bwd = Dataset.get_pair_indices(bits[1], n)
+        return np.column_stack((np.concatenate((i_fwd, j_bwd)), np.concatenate((j_fwd, i_bwd))))
+
+    @staticmethod
+    def unpack_bin(bin_data, n):
+        # dense (n x n) bool matrix of a packed bin
+        if bin_data.dtype != np.uint64:
+            return bin_data
+        temp_bin = np.zeros((n, n), dtype=bool)
+        indices = Dataset.get_bin_indices(bin_data, n)
+        temp_bin[indices[:, 0], indices[:, 1]] = True
+        return temp_bin
+
+    @staticmethod
+    def count_bin(bin_data):
+        # number of concordant pairs in a dense, packed, matrix-free or sparse bin
+        if isinstance(bin_data, (RankBin, SparseBin)):
+            return bin_data.count()
+        if bin_data.dtype != np.uint64:
+            return np.count_nonzero(bin_data)
+        return Dataset.popcount(bin_data)
+
+    @staticmethod
+    def count_bins(bins):
+        # concordant pairs of every bin in a (k x ...) tensor of dense or packed bins
+        if bins.dtype != np.uint64:
+            return np.count_nonzero(bins.reshape(bins.shape[0], -1), axis=1)
+        return np.array([Dataset.popcount(bin_data) for bin_data in bins], dtype=np.int64)
+
+    @staticmethod
+    def popcount(words, chunk_size=2 ** 20):
+        # number of set bits in an array of uint64 words
+        words = words.reshape(-1)
+        if hasattr(np, 'bitwise_count'):
+            return int(np.sum(np.bitwise_count(words), dtype=np.int64))
+        total = 0
+        for i in range(0, words.size, chunk_size):
+            x = words[i: i + chunk_size]
+            x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+            x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+            x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+            x = (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+            total += int(np.sum(x, dtype=np.int64))
+        return total
+
+    @staticmethod
+    def read_csv(file, dtype=np.float64):
+        # 1. retrieve data-set from file in a single pass: numeric columns are
+        # parsed straight into a typed (column x row) store, titles and
+        # date-time columns are kept separately
         with open(file, 'r') as f:
             dialect = csv.Sniffer().sniff(f.readline(), delimiters=";,' '\t")
             f.seek(0)
             reader = csv.reader(f, dialect)
-            temp = list(reader)
+            rows = (row for row in reader if len(row) > 0)
+            row = next(rows, None)
+            title = np.array([])
+            if row is not None:
+                title = Dataset.get_title(row)
+                if title.size > 0:
+                    row = next(rows, None)
+            if row is None:
+                f.close()
+                return title, np.array([]), np.empty((0, 0), dtype=dtype), np.empty((0, 0), dtype='U')
+
+            col_size = len(row)
+            time_cols = Dataset.get_time_cols(row)
+            num_cols = np.setdiff1d(np.arange(col_size), time_cols).tolist()
+            t_cols = time_cols.astype(int).tolist()
+            num_buf = array('d')
+            time_buf = list()
+            while row is not None:
+                try:
+                    num_buf.extend([float(row[i]) for i in num_cols])
+                except (ValueError, IndexError):
+                    num_buf.extend([Dataset.parse_float(row, i) for i in num_cols])
+                if len(t_cols) > 0:
+                    time_buf.append([row[i] if i < len(row) else '' for i in t_cols])
+                row = next(rows, None)
             f.close()
-        return temp
+
+        row_size = int(len(num_buf) / len(num_cols)) if len(num_cols) > 0 else len(time_buf)
+        attr_data = np.full((col_size, row_size), np.nan, dtype=dtype)
+        if len(num_cols) > 0:
+            num_data = np.frombuffer(num_buf, dtype=np.float64).reshape(row_size, len(num_cols))
+            attr_data[num_cols] = num_data.T
+        if len(t_cols) > 0:
+            time_data = np.array(time_buf, dtype='U').T
+        else:
+            time_data = np.empty((0, row_size), dtype='U')
+        return title, time_cols, attr_data, time_data
+
+    @staticmethod
+    def parse_float(row, i):
+        # missing or non-numeric values are stored as NaN
+        try:
+            return float(row[i])
+        except (ValueError, IndexError):
+            return np.nan
+
+    @staticmethod
+    def get_title(row):
+        if row[0].replace('.', '', 1).isdigit() or row[0].isdigit():
+            return np.array([])
+        elif len(row) > 1 and (row[1].replace('.', '', 1).isdigit() or row[1].isdigit()):
+            return np.array([])
+        else:
+            keys = np.arange(len(row))
+            values = np.array(row, dtype='S')
+            title = np.rec.fromarrays((keys, values), names=('key', 'value'))
+            return title
+
+    @staticmethod
+    def get_time_cols(row):
+        time_cols = list()
+        for i in range(len(row)):  # check every column for time format
+            row_data = str(row[i])
+            try:
+                time_ok, t_stamp = Dataset.test_time(row_data)
+                if time_ok:
+                    time_cols.append(i)
+            except ValueError:
+                continue
+        if len(time_cols) > 0:
+            return np.array(time_cols)
+        else:
+            return np.array([], dtype=int)
 
     @staticmethod
     def test_time(date_str):
@@ -184,6 +496,53 @@ class Dataset:
                 except ValueError:
                     raise ValueError('no valid date-time format found')
 
+    @staticmethod
+    def parse_timestamps(time_data):
+        # parse a date-time column once into int64 epoch seconds
+        time_data = np.asarray(time_data, dtype='U')
+        try:
+            # ISO 8601 values are converted by numpy in one go
+            stamps = time_data.astype('datetime64[s]')
+        except ValueError:
+            values, indices = np.unique(time_data, return_inverse=True)
+            t_format = Dataset.infer_time_format(values)
+            temp = [Dataset.parse_datetime(x, t_format) for x in values]
+            stamps = np.array(temp, dtype='datetime64[s]')[indices]
+        return stamps.astype(np.int64)  # NaT is stored as NAT_STAMP
+
+    @staticmethod
+    def infer_time_format(values, sample_size=50):
+        # pick the known format that parses most of a sample of the values
+        sample = values[np.unique(np.linspace(0, values.size - 1, num=min(sample_size, values.size), dtype=int))]
+        best_format = None
+        best_count = 0
+        for t_format in TIME_FORMATS:
+            count = 0
+            for x in sample:
+                try:
+                    datetime.strptime(x, t_format)
+                    count += 1
+                except ValueError:
+                    continue
+            if count > best_count:
+                best_format = t_format
+                best_count = count
+        return best_format
+
+    @staticmethod
+    def parse_datetime(date_str, t_format=None):
+        try:
+            if t_format is not None:
+                return datetime.strptime(date_str, t_format)
+        except ValueError:
+            pass
+        try:
+            if Dataset.test_time(date_str)[0]:
+                return parse(date_str).replace(tzinfo=None)
+        except (ValueError, OverflowError):
+            pass
+        return np.datetime64('NaT')
+
     @staticmethod
     def get_timestamp(time_data):
         try:
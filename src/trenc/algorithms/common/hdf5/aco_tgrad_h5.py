@@ -18,7 +18,7 @@ from .dataset_h5 import Dataset_h5
 from .aco_grad_h5 import GradACO_h5
 from ..aco_tgrad import T_GradACO
 from ..fuzzy_mf import calculate_time_lag
-from ..gp import GP, TGP
+from ..gp import TGP
 from ..profile_cpu import Profile
 
 
@@ -40,41 +40,22 @@ class GradACOt_h5 (GradACO_h5):
 
     def validate_gp(self, pattern):
         # pattern = [('2', '+'), ('4', '+')]
-        min_supp = self.d_set.thd_supp
-        gen_pattern = GP()
-        bin_data = np.array([])
-
-        for gi in pattern.gradual_items:
-            if self.d_set.invalid_bins.size > 0 and np.any(np.isin(self.d_set.invalid_bins, gi.gradual_item)):
-                continue
-            else:
-                grp = 'dataset/' + self.d_set.step_name + '/valid_bins/' + gi.as_string()
-                temp = self.d_set.read_h5_dataset(grp)
-                if bin_data.size <= 0:
-                    bin_data = np.array([temp, temp])
-                    gen_pattern.add_gradual_item(gi)
-                else:
-                    bin_data[1] = temp
-                    temp_bin, supp = self.bin_and(bin_data, self.d_set.attr_size)
-                    if supp >= min_supp:
-                        bin_data[0] = temp_bin
-                        gen_pattern.add_gradual_item(gi)
-                        gen_pattern.set_support(supp)
+        gen_pattern, bin_data = self.and_items(pattern)
         if len(gen_pattern.gradual_items) <= 1:
             tgp = TGP(gp=pattern)
             return tgp
         else:
             # t_lag = FuzzyMF.calculate_time_lag(FuzzyMF.get_patten_indices(bin_data[0]), t_diffs, min_supp)
-            t_lag = calculate_time_lag(bin_data[0], self.time_diffs)
+            t_lag = calculate_time_lag(bin_data, self.time_diffs)
             if t_lag.support <= 0:
                 gen_pattern.set_support(0)
-            tgp = TGP(gp=gen_pattern, t_lag=t_lag)
+            tgp = TGP(gp=gen_pattern.to_canonical(), t_lag=t_lag)
             return tgp
 
 
 class T_GradACO_h5(T_GradACO):
 
-    def __init__(self, f_path, eq, ref_item, min_sup, min_rep, cores):
+    def __init__(self, f_path, eq, ref_item, min_sup, min_rep, cores, seed=None):
         # For tgraank
         # self.d_set = d_set
         self.d_set = Dataset_h5(f_path, min_sup=min_sup, eq=eq)
@@ -86,20 +67,26 @@ class T_GradACO_h5(T_GradACO):
             self.time_cols = cols
             self.min_sup = min_sup
             self.ref_item = ref_item
-            self.d_set.data = self.d_set.read_h5_dataset('dataset/data')
-            self.d_set.data = np.array(self.d_set.data).astype('U')
+            self.d_set.attr_data = self.d_set.read_h5_dataset('dataset/attr_data')
+            self.d_set.time_data = self.d_set.read_h5_dataset('dataset/time_data').astype('U')
+            self.d_set.time_stamps = self.d_set.read_h5_dataset('dataset/time_stamps')
             self.max_step = self.get_max_step(min_rep)
-            self.orig_attr_data = self.d_set.data.copy().T
+            self.orig_attr_data = self.d_set.attr_data
             if cores > 1:
                 self.cores = cores
             else:
                 self.cores = Profile.get_num_cores()
+            self.seed = seed
         else:
             print("Dataset Error")
             self.time_ok = False
             self.time_cols = []
             raise Exception('No date-time data found')
 
+    def get_valid_steps(self):
+        # bins are kept in the h5 file: the full (step 0) bins are not built to skip steps
+        return list(range(self.max_step))
+
     def fetch_patterns(self, step):
         step += 1  # because for-loop is not inclusive from range: 0 - max_step
         # 1. Transform data
@@ -107,7 +94,7 @@ class T_GradACO_h5(T_GradACO):
         attr_data, time_diffs = self.transform_data(step)
 
         # 2. Execute aco-graank for each transformation
-        ac = GradACOt_h5(d_set, attr_data, time_diffs)
+        ac = self.init_colony(GradACOt_h5(d_set, attr_data, time_diffs), step)
         list_gp = ac.run_ant_colony()
         # print("\nPheromone Matrix")
         # print(ac.p_matrix)
@@ -115,3 +102,32 @@ class T_GradACO_h5(T_GradACO):
             return list_gp
         return False
 
+    def transform_data(self, step):  # optimized
+        # NB: Restructure dataset based on reference item
+        time_diffs = self.check_transform(step)
+        ref_col = self.ref_item
+
+        # 1. Split the transpose data set into column-tuples
+        attr_data = self.orig_attr_data
+
+        # 2. Transform the data using (row) n+step
+        new_attr_data = list()
+        size = len(attr_data)
+        for k in range(size):
+            col_index = k
+            tuples = attr_data[k]
+            n = tuples.size
+            # temp_tuples = np.empty(n, )
+            # temp_tuples[:] = np.NaN
+            if col_index in self.time_cols:
+                # date-time attribute
+                temp_tuples = tuples[:]
+            elif col_index == ref_col:
+                # reference attribute
+                temp_tuples = tuples[0: n - step]
+            else:
+                # other attributes
+                temp_tuples = tuples[step: n]
+            # print(temp_tuples)
+            new_attr_data.append(temp_tuples)
+        return new_attr_data, time_diffs
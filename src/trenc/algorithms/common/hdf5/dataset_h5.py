@@ -15,6 +15,10 @@ Changes
 2. Fetch all binaries during initialization
 3. Replaced loops for fetching binary rank with numpy function
 4. Used HDF5 storage
+5. Store typed column data (attr_data) and date-time strings (time_data) separately
+6. Store only the '+' bin of an attribute, the '-' bin is read as its transpose (read_valid_bin)
+7. 1-item supports from tie counts: bins of invalid columns are never built
+8. Layout version of the h5 file (H5_FORMAT): files of another layout are rebuilt
 
 """
 
@@ -29,11 +33,17 @@ from ..dataset import Dataset
 # from src.algorithms.common.gp import GI, GP
 # from cython.parallel import prange
 
+H5_FORMAT = 2  # layout of the h5 file: typed attr_data, '+' bins only ('<col>_pos')
+
 
 class Dataset_h5(Dataset):
 
-    def __init__(self, file_path, min_sup=0, eq=False):
+    def __init__(self, file_path, min_sup=0, eq=False, dtype=np.float64):
         self.h5_file = str(Path(file_path).stem) + str('.h5')
+        if os.path.exists(self.h5_file) and not Dataset_h5.is_current_h5(self.h5_file):
+            # h5 file of an older layout: rebuilt from the csv file
+            print("Rebuilding h5 file")
+            os.remove(self.h5_file)
         if os.path.exists(self.h5_file):
             print("Fetching data from h5 file")
             h5f = h5py.File(self.h5_file, 'r')
@@ -49,35 +59,33 @@ class Dataset_h5(Dataset):
             h5f.close()
             self.thd_supp = min_sup
             self.equal = eq
-            self.data = None
+            self.attr_data = None
+            self.time_data = None
+            self.time_stamps = None
         else:
-            data = Dataset.read_csv(file_path)
-            if len(data) <= 1:
-                self.data = np.array([])
-                data = None
+            self.title, self.time_cols, self.attr_data, self.time_data = Dataset.read_csv(file_path, dtype)
+            if self.attr_data.shape[1] < 2:
+                self.attr_data = np.array([])
                 print("csv file read error")
                 raise Exception("Unable to read csv file or file has no data")
             else:
                 print("Data fetched from csv file")
-                self.data = np.array([])
-                self.title = self.get_title(data)  # optimized (numpy)
-                self.time_cols = self.get_time_cols()  # optimized (numpy)
                 self.attr_cols = self.get_attributes()  # optimized (numpy)
                 self.column_size = self.get_attribute_no()  # optimized (numpy)
                 self.size = self.get_size()  # optimized (numpy)
+                self.time_stamps = self.get_time_stamps()  # optimized (numpy)
                 self.attr_size = 0
                 self.step_name = ''
                 self.thd_supp = min_sup
                 self.equal = eq
                 self.invalid_bins = np.array([])
-                data = None
             #    self.init_attributes()
 
     def init_attributes(self):
         # (check) implement parallel multiprocessing
-        if self.data is not None:
-            # transpose csv array data
-            attr_data = self.data.copy().T
+        if self.attr_data is not None:
+            # csv data is already stored column-wise
+            attr_data = self.attr_data
             self.attr_size = len(attr_data[self.attr_cols[0]])
             # create h5 groups to store class attributes
             self.init_h5_groups()
@@ -92,20 +100,20 @@ class Dataset_h5(Dataset):
         self.step_name = 'step_' + str(int(self.size - self.attr_size))
         invalid_bins = list()
         for col in self.attr_cols:
-            col_data = np.array(attr_data[col], dtype=float)
+            col_data = attr_data[col]
             incr = np.array((col, '+'), dtype='i, S1')
             decr = np.array((col, '-'), dtype='i, S1')
-            temp_pos = Dataset.bin_rank(col_data, equal=self.equal)
-            supp = float(np.sum(temp_pos)) / float(n * (n - 1.0) / 2.0)
+            # 1-item support from the tie counts: no bin for invalid columns
+            supp = float(Dataset.count_rank_pairs(col_data, self.equal)) / float(n * (n - 1.0) / 2.0)
 
             if supp < self.thd_supp:
                 invalid_bins.append(incr)
                 invalid_bins.append(decr)
             else:
+                temp_pos = Dataset.bin_rank(col_data, equal=self.equal)
+                # only the '+' bin is stored, the '-' bin is its transpose
                 grp = 'dataset/' + self.step_name + '/valid_bins/' + str(col) + '_pos'
                 self.add_h5_dataset(grp, temp_pos)
-                grp = 'dataset/' + self.step_name + '/valid_bins/' + str(col) + '_neg'
-                self.add_h5_dataset(grp, temp_pos.T)
         self.invalid_bins = np.array(invalid_bins)
         grp = 'dataset/' + self.step_name + '/invalid_bins'
         self.add_h5_dataset(grp, self.invalid_bins)
@@ -118,15 +126,28 @@ class Dataset_h5(Dataset):
             pass
         else:
             h5f = h5py.File(self.h5_file, 'w')
+            h5f.attrs['format'] = H5_FORMAT
             grp = h5f.require_group('dataset')
             grp.create_dataset('title', data=self.title)
-            data = np.array(self.data.copy()).astype('S')
-            grp.create_dataset('data', data=data, compression="gzip", compression_opts=9)
+            grp.create_dataset('attr_data', data=self.attr_data, compression="gzip", compression_opts=9)
+            time_data = np.array(self.time_data).astype('S')
+            grp.create_dataset('time_data', data=time_data, compression="gzip", compression_opts=9)
+            grp.create_dataset('time_stamps', data=self.time_stamps)
             grp.create_dataset('time_cols', data=self.time_cols)
             grp.create_dataset('attr_cols', data=self.attr_cols)
             h5f.close()
-            data = None
-            self.data = None
+            time_data = None
+            self.attr_data = None
+            self.time_data = None
+            self.time_stamps = None
+
+    @staticmethod
+    def is_current_h5(h5_file):
+        # the h5 file has the layout that this class reads and writes
+        h5f = h5py.File(h5_file, 'r')
+        h5_format = h5f.attrs.get('format', 0)
+        h5f.close()
+        return h5_format == H5_FORMAT
 
     def read_h5_dataset(self, group):
         temp = np.array([])
@@ -136,6 +157,18 @@ class Dataset_h5(Dataset):
         h5f.close()
         return temp
 
+    def get_valid_size(self):
+        # the bins are kept in the h5 file: valid items are the ones not listed as invalid
+        return 2 * len(self.attr_cols) - len(self.invalid_bins)
+
+    def read_valid_bin(self, gi):
+        grp = 'dataset/' + self.step_name + '/valid_bins/' + str(gi.attribute_col) + '_pos'
+        temp = self.read_h5_dataset(grp)
+        symbol = gi.symbol.decode() if isinstance(gi.symbol, bytes) else gi.symbol
+        if symbol == '-':
+            temp = temp.T
+        return temp
+
     def add_h5_dataset(self, group, data):
         h5f = h5py.File(self.h5_file, 'r+')
         if group in h5f:
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@credits: "Thomas Runkler, Edmond Menya, and Anne Laurent,"
+@license: "MIT"
+@version: "1.0"
+@email: "owuordickson@gmail.com"
+@created: "18 October 2026"
+
+Description: pheromone engine shared by all the ACO variants
+
+p_matrix holds one row per attribute column: [+, -, x] (increasing, decreasing, irrelevant).
+The cumulative probabilities of '+' and '+ or -' are kept for every row and refreshed for the
+rows touched by a deposit, so that a whole pattern is sampled with one vectorized draw.
+Evaporation decays every cell towards its initial value of 1. An optional prior (e.g. the
+pheromone of the previous temporal step) is added to p_matrix for sampling only.
+
+"""
+
+import numpy as np
+
+
+class Pheromone:
+
+    def __init__(self, p_matrix, rng=None, prior=None):
+        self.p_matrix = np.asarray(p_matrix, dtype=float)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.prior = prior
+        self.cum_probs = np.zeros((self.p_matrix.shape[0], 2), dtype=float)
+        self.update_probs()
+
+    def update_probs(self, rows=None):
+        if rows is None:
+            rows = np.arange(self.p_matrix.shape[0])
+        p = self.get_weights(rows)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total = np.sum(p, axis=1)
+            self.cum_probs[rows, 0] = p[:, 0] / total
+            self.cum_probs[rows, 1] = (p[:, 0] + p[:, 1]) / total
+
+    def get_weights(self, rows):
+        # sampling weights: pheromone (and prior)
+        if self.prior is None:
+            return self.p_matrix[rows]
+        return self.p_matrix[rows] + self.prior[rows]
+
+    def sample(self, attr_cols):
+        # attributes of one random pattern (in random order) and their symbols
+        attr_cols = np.asarray(attr_cols, dtype=int)
+        n = attr_cols.size
+        cols = attr_cols[self.rng.permutation(n)]
+        max_extreme = n * 100
+        x = self.rng.integers(1, max_extreme, size=n) / max_extreme
+        probs = self.cum_probs[cols]
+        is_pos = x < probs[:, 0]
+        is_neg = (x >= probs[:, 0]) & (x < probs[:, 1])
+        chosen = is_pos | is_neg
+        symbols = np.where(is_pos[chosen], '+', '-')
+        return cols[chosen], symbols
+
+    def deposit(self, attr_cols, pattern, weight=1):
+        # weight on the symbol of every item of pattern and 1 on 'irrelevant' for the
+        # other attributes; returns the (row, col) cells of the items
+        attr_cols = np.asarray(attr_cols, dtype=int)
+        rows = np.array([int(gi.attribute_col) for gi in pattern.gradual_items], dtype=int)
+        cols = np.array([(0 if gi.symbol == '+' else 1) for gi in pattern.gradual_items], dtype=int)
+        self.p_matrix[rows, cols] += weight
+        absent = np.ones(self.p_matrix.shape[0], dtype=bool)
+        absent[rows] = False
+        self.p_matrix[attr_cols[absent[attr_cols]], 2] += 1
+        self.update_probs(attr_cols)
+        return rows, cols
+
+    def evaporate(self, attr_cols, e_factor):
+        attr_cols = np.asarray(attr_cols, dtype=int)
+        self.p_matrix[attr_cols] = 1 + (1 - e_factor) * (self.p_matrix[attr_cols] - 1)
+        self.update_probs(attr_cols)
+
+    def get_entropy(self, attr_cols):
+        # mean entropy of the [+, -, x] probabilities (1: uniform, 0: converged)
+        p = self.get_weights(np.asarray(attr_cols, dtype=int))
+        if p.shape[0] <= 0:
+            return 0
+        p = p / np.sum(p, axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            h = -np.sum(np.where(p > 0, p * np.log(p), 0), axis=1) / np.log(3)
+        return float(np.mean(h))
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@credits: "Thomas Runkler, Edmond Menya, and Anne Laurent,"
+@license: "MIT"
+@version: "1.0"
+@email: "owuordickson@gmail.com"
+@created: "18 October 2026"
+
+Description: checkpoint store of the pheromone learned by the ACO miners
+
+Every checkpoint is an .npz file holding the colony state (p_matrix - 1 and, for the GR
+variants, steps_matrix). The file is keyed by the ACO class, the parameters (min. support,
+eq, tag) and the attribute titles, so a similar data set (same columns, different rows)
+finds it too. A checkpoint of the same data (fingerprint of attr_data) is loaded as it is;
+a checkpoint of a similar data set is scaled by weight (0: cold start, 1: full warm start).
+
+"""
+
+import os
+import hashlib
+import numpy as np
+
+
+class PheromoneStore:
+
+    def __init__(self, dir_path, weight=1.0):
+        if (weight < 0) or (weight > 1):
+            raise Exception("Checkpoint weight must be in [0, 1]")
+        self.dir_path = dir_path
+        self.weight = weight
+        os.makedirs(dir_path, exist_ok=True)
+
+    def save(self, aco, tag=''):
+        state = aco.get_colony_state()
+        arrays = {key: value for key, value in state.items() if isinstance(value, np.ndarray)}
+        path = self.get_path(aco, tag)
+        # write then rename: a reader never sees a partial checkpoint
+        temp_path = path[:-len('.npz')] + '_' + str(os.getpid()) + '.tmp.npz'
+        np.savez(temp_path, fingerprint=np.array(PheromoneStore.get_fingerprint(aco.d_set)), **arrays)
+        os.replace(temp_path, path)
+
+    def load(self, aco, tag=''):
+        # warm start aco from its checkpoint; False if there is none
+        path = self.get_path(aco, tag)
+        if not os.path.exists(path):
+            return False
+        state = aco.get_colony_state()
+        with np.load(path) as data:
+            fingerprint = PheromoneStore.get_fingerprint(aco.d_set)
+            if (fingerprint != '') and (str(data['fingerprint']) == fingerprint):
+                weight = 1.0
+            else:
+                weight = self.weight
+            for key, value in state.items():
+                if isinstance(value, np.ndarray) and (key in data.files) and (data[key].shape == value.shape):
+                    state[key] = weight * data[key]
+        aco.set_colony_state(state)
+        return True
+
+    def get_path(self, aco, tag=''):
+        d_set = aco.d_set
+        items = [type(aco).__name__, str(d_set.thd_supp), str(d_set.equal), str(tag), str(d_set.column_size)]
+        items.extend([str(title[1]) for title in d_set.title])
+        key = hashlib.sha1('|'.join(items).encode()).hexdigest()
+        return os.path.join(self.dir_path, key + '.npz')
+
+    @staticmethod
+    def get_fingerprint(d_set):
+        if d_set.attr_data is None:
+            return ''
+        attr_data = np.ascontiguousarray(d_set.attr_data)
+        return hashlib.sha1(attr_data.tobytes() + str(attr_data.shape).encode()).hexdigest()
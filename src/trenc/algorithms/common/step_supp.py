@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@credits: "Anne Laurent and Joseph Orero"
+@license: "MIT"
+@version: "1.0"
+@email: "owuordickson@gmail.com"
+@created: "18 October 2026"
+
+Description: support of one temporal gradual pattern at every step (1 ... max_step)
+
+For step s, the reference attribute uses rows [0, n-s) and all the other attributes use
+rows [s, n). So the concordant pairs of a pattern at step s are the sum over
+R[:n-s, :n-s] & A[s:, s:], where R is the (full) bin of the reference item and A is the
+AND of the (full) bins of the other items. Every diagonal of R is correlated with the
+same diagonal of A, which yields the pair counts of all the steps in O(n^2 log n).
+
+"""
+
+import numpy as np
+
+
+def get_step_supports(ref_bin, bin_data, max_step):
+    n = bin_data.shape[0]
+    if ref_bin is None:
+        counts = count_block_pairs(bin_data, max_step)
+    else:
+        counts = correlate_diagonals(ref_bin, bin_data, max_step)
+    sizes = n - np.arange(1, max_step + 1, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        supports = counts / (sizes * (sizes - 1.0) / 2.0)
+    return np.nan_to_num(supports)
+
+
+def correlate_diagonals(ref_bin, bin_data, max_step):
+    # count[s] = sum over all diagonals d of: sum_k r_d[k] * a_d[k + s]
+    n = bin_data.shape[0]
+    size = int(2 ** np.ceil(np.log2(2 * n)))  # fft length without wrap-around
+    chunk = max(1, int(2 ** 22 / size))  # diagonals per fft batch
+    offsets = np.arange(-(n - 1), n)
+    spectrum = np.zeros(int(size / 2) + 1, dtype=complex)
+    for c in range(0, offsets.size, chunk):
+        lst_d = offsets[c: c + chunk]
+        r_diags = np.zeros((lst_d.size, size))
+        a_diags = np.zeros((lst_d.size, size))
+        for k in range(lst_d.size):
+            r_d = np.diagonal(ref_bin, lst_d[k])
+            r_diags[k, 0: r_d.size] = r_d
+            a_diags[k, 0: r_d.size] = np.diagonal(bin_data, lst_d[k])
+        temp = np.conj(np.fft.rfft(r_diags, axis=1)) * np.fft.rfft(a_diags, axis=1)
+        spectrum += np.sum(temp, axis=0)
+    counts = np.rint(np.fft.irfft(spectrum, size))
+    return counts[1: max_step + 1]
+
+
+def count_block_pairs(bin_data, max_step):
+    # count[s] = sum over bin_data[s:, s:]; a pair (i, j) counts for all s <= min(i, j)
+    n = bin_data.shape[0]
+    chunk = max(1, int(2 ** 22 / n))  # rows per batch
+    tails = np.zeros(n)
+    for i in range(0, n, chunk):
+        block = bin_data[i: i + chunk]
+        tails[i: i + block.shape[0]] += np.sum(np.triu(block, k=i), axis=1)
+        tails += np.sum(np.tril(block, k=i - 1), axis=0)
+    counts = np.cumsum(tails[::-1])[::-1]
+    return counts[1: max_step + 1]
@@ -14,7 +14,6 @@ Description: updated version that uses aco-graank and parallel multi-processing
 """
 
 # from joblib import Parallel, delayed
-import numpy as np
 import multiprocessing as mp
 from .dataset import Dataset
 from .profile_cpu import Profile
@@ -23,10 +22,10 @@ from .graank_v2 import graank
 
 class Tgrad:
 
-    def __init__(self, f_path, eq, ref_item, min_sup, min_rep, cores):
+    def __init__(self, f_path, eq, ref_item, min_sup, min_rep, cores, packed=False, matrix_free=False):
         # For tgraank
         # self.d_set = d_set
-        self.d_set = Dataset(f_path, min_sup=min_sup, eq=eq)
+        self.d_set = Dataset(f_path, min_sup=min_sup, eq=eq, packed=packed, matrix_free=matrix_free)
         cols = self.d_set.time_cols
         if len(cols) > 0:
             print("Dataset Ok")
@@ -35,7 +34,6 @@ class Tgrad:
             self.min_sup = min_sup
             self.ref_item = ref_item
             self.max_step = self.get_max_step(min_rep)
-            self.orig_attr_data = self.d_set.data.copy().T
             self.cores = cores
         else:
             print("Dataset Error")
@@ -44,10 +42,11 @@ class Tgrad:
             raise Exception('No date-time data found')
 
     def get_max_step(self, min_rep):  # optimized
-        all_rows = len(self.d_set.data)
+        all_rows = self.d_set.size
         return all_rows - int(min_rep * all_rows)
 
     def run_tgraank(self, parallel=False):
+        global shared_tgrad
         if parallel:
             # implement parallel multi-processing
             if self.cores > 1:
@@ -56,15 +55,19 @@ class Tgrad:
                 num_cores = Profile.get_num_cores()
 
             self.cores = num_cores
-            steps = range(self.max_step)
+            steps = self.get_valid_steps()
+            # forked workers inherit this instance (and its full bins): it is not pickled
+            is_fork = (mp.get_start_method() == 'fork')
+            shared_tgrad = self
             pool = mp.Pool(num_cores)
-            patterns = pool.map(self.fetch_patterns, steps)
+            patterns = pool.map(fetch_step, [(None if is_fork else self, step) for step in steps])
             pool.close()
             pool.join()
+            shared_tgrad = None
             return patterns
         else:
             patterns = list()
-            for step in range(self.max_step):
+            for step in self.get_valid_steps():
                 t_pattern = self.fetch_patterns(step)
                 if t_pattern:
                     patterns.append(t_pattern)
@@ -72,20 +75,32 @@ class Tgrad:
 
     def fetch_patterns(self, step):
         step += 1  # because for-loop is not inclusive from range: 0 - max_step
-        # 1. Transform data
+        # 1. Transform data (bins are views of the full bins)
         d_set = self.d_set
-        attr_data, time_diffs = self.transform_data(step)
+        time_diffs = self.transform_bins(step)
 
         # 2. Execute t-graank for each transformation
-        d_set.update_attributes(attr_data)
         tgps = graank(t_diffs=time_diffs, d_set=d_set)
 
         if len(tgps) > 0:
             return tgps
         return False
 
-    def transform_data(self, step):  # optimized
-        # NB: Restructure dataset based on reference item
+    def get_step_supports(self, pattern):
+        # support of pattern for every step (1 ... max_step) without mining each step
+        return self.d_set.get_step_supports(pattern, self.ref_item, self.max_step)
+
+    def get_valid_steps(self):
+        # steps with at least one frequent pair (see Dataset.get_valid_steps)
+        return self.d_set.get_valid_steps(self.ref_item, self.max_step, self.min_sup)
+
+    def transform_bins(self, step):  # optimized
+        # NB: bins of the transformed data are views of the full (step 0) bins
+        time_diffs = self.check_transform(step)
+        self.d_set.update_step_bins(step, self.ref_item)
+        return time_diffs
+
+    def check_transform(self, step):
         if self.time_ok:
             # 1. Calculate time difference using step
             ok, time_diffs = self.get_time_diffs(step)
@@ -98,55 +113,26 @@ class Tgrad:
                 if ref_col in self.time_cols:
                     msg = "Reference column is a 'date-time' attribute"
                     raise Exception(msg)
-                elif (ref_col < 0) or (ref_col >= len(self.d_set.title)):
+                elif (ref_col < 0) or (ref_col >= self.d_set.column_size):
                     msg = "Reference column does not exist\nselect column between: " \
-                          "0 and " + str(len(self.d_set.title) - 1)
+                          "0 and " + str(self.d_set.column_size - 1)
                     raise Exception(msg)
                 else:
-                    # 1. Split the transpose data set into column-tuples
-                    attr_data = self.orig_attr_data
-
-                    # 2. Transform the data using (row) n+step
-                    new_attr_data = list()
-                    size = len(attr_data)
-                    for k in range(size):
-                        col_index = k
-                        tuples = attr_data[k]
-                        n = tuples.size
-                        # temp_tuples = np.empty(n, )
-                        # temp_tuples[:] = np.NaN
-                        if col_index in self.time_cols:
-                            # date-time attribute
-                            temp_tuples = tuples[:]
-                        elif col_index == ref_col:
-                            # reference attribute
-                            temp_tuples = tuples[0: n - step]
-                        else:
-                            # other attributes
-                            temp_tuples = tuples[step: n]
-                        # print(temp_tuples)
-                        new_attr_data.append(temp_tuples)
-                    return new_attr_data, time_diffs
+                    return time_diffs
         else:
             msg = "Fatal Error: Time format in column could not be processed"
             raise Exception(msg)
 
     def get_time_diffs(self, step):  # optimized
-        data = self.d_set.data
-        size = len(data)
-        time_diffs = []
-        for i in range(size):
-            if i < (size - step):
-                # for col in self.time_cols:
-                col = self.time_cols[0]  # use only the first date-time value
-                temp_1 = str(data[i][int(col)])
-                temp_2 = str(data[i + step][int(col)])
-                stamp_1 = Dataset.get_timestamp(temp_1)
-                stamp_2 = Dataset.get_timestamp(temp_2)
-                if (not stamp_1) or (not stamp_2):
-                    return False, [i + 1, i + step + 1]
-                time_diff = (stamp_2 - stamp_1)
-                # index = tuple([i, i + step])
-                # time_diffs.append([time_diff, index])
-                time_diffs.append([time_diff, i])
-        return True, np.array(time_diffs)
+        return self.d_set.get_time_diffs(step)
+
+
+shared_tgrad = None  # Tgrad instance of the pool of steps (inherited by forked workers)
+
+
+def fetch_step(args):
+    # patterns of one step, from the instance inherited by the worker
+    tgrad, step = args
+    if tgrad is None:
+        tgrad = shared_tgrad
+    return tgrad.fetch_patterns(step)
@@ -36,60 +36,16 @@ class GradACOgr_h5(GradACO_h5):
         self.sup_matrix = np.array([])
 
     def deposit_pheromone(self, pattern=GP()):
-        lst_attr = []
-        for obj in pattern.gradual_items:
-            # print(obj.attribute_col)
-            attr = obj.attribute_col
-            symbol = obj.symbol
-            lst_attr.append(attr)
-            i = attr
-            if symbol == '+':
-                self.p_matrix[i][0] += pattern.support
-                self.steps_matrix[i][0] += 1
-            elif symbol == '-':
-                self.p_matrix[i][1] += pattern.support
-                self.steps_matrix[i][1] += 1
-        for index in self.attr_index:
-            if int(index) not in lst_attr:
-                i = int(index)
-                self.p_matrix[i][2] += 1
+        rows, cols = self.pheromone.deposit(self.attr_index, pattern, pattern.support)
+        self.steps_matrix[rows, cols] += 1
 
-    def run_ant_colony(self):
-        min_supp = self.d_set.thd_supp
-        winner_gps = list()  # subsets
-        loser_gps = list()  # supersets
-        repeated = 0
-        while repeated < 1:
-            rand_gp = self.generate_random_gp()
-            if len(rand_gp.gradual_items) > 1:
-                # print(rand_gp.get_pattern())
-                exits = GradACOgr_h5.is_duplicate(rand_gp, winner_gps, loser_gps)
-                if not exits:
-                    repeated = 0
-                    # check for anti-monotony
-                    is_super = GradACOgr_h5.check_anti_monotony(loser_gps, rand_gp, subset=False)
-                    is_sub = GradACOgr_h5.check_anti_monotony(winner_gps, rand_gp, subset=True)
-                    if is_super or is_sub:
-                        continue
-                    gen_gp = self.validate_gp(rand_gp)
-                    if gen_gp.support >= min_supp:
-                        self.deposit_pheromone(gen_gp)
-                        is_present = GradACOgr_h5.is_duplicate(gen_gp, winner_gps, loser_gps)
-                        is_sub = GradACOgr_h5.check_anti_monotony(winner_gps, gen_gp, subset=True)
-                        if is_present or is_sub:
-                            repeated += 1
-                        else:
-                            winner_gps.append(gen_gp)
-                    else:
-                        loser_gps.append(gen_gp)
-                        # update pheromone as irrelevant with loss_sols
-                        # self.vaporize_pheromone(gen_gp, self.e_factor)
-                    if set(gen_gp.get_pattern()) != set(rand_gp.get_pattern()):
-                        loser_gps.append(rand_gp)
-                else:
-                    repeated += 1
-        grp = 'dataset/' + self.d_set.step_name + '/p_matrix'
-        self.d_set.add_h5_dataset(grp, self.p_matrix)
+    def evaporate_pheromone(self):
+        # decay the deposit counts too: sup_matrix stays the (weighted) mean support
+        super().evaporate_pheromone()
+        self.steps_matrix = self.steps_matrix.astype(float)
+        self.steps_matrix[self.attr_index] *= (1 - self.e_factor)
+
+    def save_state(self):
+        super().save_state()
         grp = 'dataset/' + self.d_set.step_name + '/steps_matrix'
         self.d_set.add_h5_dataset(grp, self.steps_matrix)
-        return winner_gps
@@ -21,13 +21,15 @@ from ....common.profile_cpu import Profile
 
 class Trenc_GP_h5(Trenc_GP):
 
-    def __init__(self, f_paths, min_sup, ref_dset_id, cores=0, allow_para=1):
+    def __init__(self, f_paths, min_sup, ref_dset_id, cores=0, allow_para=1, seed=None, store=None):
         self.paths = Trenc_GP.get_paths(f_paths)
         if len(self.paths) < 2:
             raise Exception("File Path Error: less than 2 paths found")
         else:
             self.min_sup = min_sup
             self.ref_ds_id = ref_dset_id
+            self.seed = seed
+            self.store = store
             if cores > 1:
                 self.cores = cores
             else:
@@ -52,8 +54,11 @@ class Trenc_GP_h5(Trenc_GP):
         return d_set
 
     @staticmethod
-    def extract_gps(d_set):
+    def extract_gps(d_set, seed=None, store=None, tag=''):
         ac = GradACOgr_h5(d_set)
+        ac.set_seed(seed)
+        if store is not None:
+            ac.set_store(store, tag)
         ac.run_ant_colony()
         p_matrix = (ac.p_matrix - 1)
         st_matrix = ac.steps_matrix
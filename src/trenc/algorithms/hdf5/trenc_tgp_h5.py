@@ -19,7 +19,8 @@ from ....common.profile_cpu import Profile
 
 class Trenc_TGP_h5(Trenc_TGP):
 
-    def __init__(self, f_paths, min_sup, min_rep, ref_item, ref_dset_id, cores=0, allow_para=1):
+    def __init__(self, f_paths, min_sup, min_rep, ref_item, ref_dset_id, cores=0, allow_para=1, seed=None,
+                 store=None):
         self.paths = Trenc_TGP_h5.get_paths(f_paths)
         if len(self.paths) > 1:
             raise Exception("File Path Error: more than 1 path found")
@@ -41,7 +42,8 @@ class Trenc_TGP_h5(Trenc_TGP):
 
             self.ref_dset = []
             d_set = self.get_dataset(f_paths)
-            self.tg_set = T_GradACOgrH5(d_set, ref_item, min_rep, self.cores)
+            self.tg_set = T_GradACOgrH5(d_set, ref_item, min_rep, self.cores, seed)
+            self.tg_set.set_store(store)
             self.titles = d_set.title
 
     def get_dataset(self, path):
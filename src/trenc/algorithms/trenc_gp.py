@@ -22,13 +22,15 @@ from .common.ep import GEP
 
 class Trenc_GP:
 
-    def __init__(self, f_paths, min_sup, ref_dset_id, cores=0, allow_para=1):
+    def __init__(self, f_paths, min_sup, ref_dset_id, cores=0, allow_para=1, seed=None, store=None):
         self.paths = Trenc_GP.get_paths(f_paths)
         if len(self.paths) < 2:
             raise Exception("File Path Error: less than 2 paths found")
         else:
             self.min_sup = min_sup
             self.ref_ds_id = ref_dset_id
+            self.seed = seed
+            self.store = store
             if cores > 1:
                 self.cores = cores
             else:
@@ -96,16 +98,20 @@ class Trenc_GP:
         return True
 
     def fetch_gps(self):
+        # data set i has its own random stream [seed, i]
+        # (and its own pheromone checkpoint 'dset_i')
+        seeds = [(None if self.seed is None else [self.seed, i]) for i in range(len(self.d_sets))]
+        args = [(self.d_sets[i], seeds[i], self.store, 'dset_' + str(i)) for i in range(len(self.d_sets))]
         if self.allow_parallel:
             num_cores = self.cores
             pool = mp.Pool(num_cores)
             # run aco-grad (multiple files)
-            aco_objs = pool.map(self.extract_gps, self.d_sets)
+            aco_objs = pool.starmap(self.extract_gps, args)
         else:
             aco_objs = list()
-            for d_set in self.d_sets:
+            for arg in args:
                 # run aco-grad (multiple files)
-                obj = self.extract_gps(d_set)
+                obj = self.extract_gps(*arg)
                 aco_objs.append(obj)
         return aco_objs
 
@@ -122,8 +128,11 @@ class Trenc_GP:
         return lst_eps
 
     @staticmethod
-    def extract_gps(d_set):
+    def extract_gps(d_set, seed=None, store=None, tag=''):
         ac = GradACOgr(d_set)
+        ac.set_seed(seed)
+        if store is not None:
+            ac.set_store(store, tag)
         ac.run_ant_colony()
         p_matrix = (ac.p_matrix - 1)
         st_matrix = ac.steps_matrix
@@ -200,6 +209,8 @@ class Trenc_GP:
                     row_j = GR_matrix[j]
                     pat = Trenc_GP.combine_gps(pat, row_j, j)
                 if (len(pat) > 0) and len(pat[0].gradual_items) > 1:
+                    # report the canonical form ('+' on attr)
+                    pat[0].to_canonical()
                     if pat[1] == -1:
                         gep = GEP(pat[0])
                     else:
@@ -8,13 +8,14 @@
 @modified: "02 June 2020"
 
 Usage:
-    $python3 init_trenc.py -f fileName.csv -c refCol -s minSup  -r minRep
+    $python3 init_trenc.py -f fileName.csv -c refCol -s minSup  -r minRep -e seed
 
 Description:
     f -> file path (CSV)
     c -> reference column
     s -> minimum support
     r -> representativity
+    e -> random seed (reproducible runs)
 
 """
 
@@ -24,12 +25,12 @@ from src.trenc.algorithms.hdf5.trenc_gp_h5 import Trenc_GP_h5
 from src.trenc.algorithms.hdf5.trenc_tgp_h5 import Trenc_TGP_h5
 
 
-def init_trenc(paths, minSup, ref_item, ref_dset, cores, allow_para, minRep):
+def init_trenc(paths, minSup, ref_item, ref_dset, cores, allow_para, minRep, seed=None):
     try:
         if minRep == 0:
-            ep_set = Trenc_GP_h5(paths, minSup, ref_dset, cores, allow_para)
+            ep_set = Trenc_GP_h5(paths, minSup, ref_dset, cores, allow_para, seed)
         else:
-            ep_set = Trenc_TGP_h5(paths, minSup, minRep, ref_item, ref_dset, cores, allow_para)
+            ep_set = Trenc_TGP_h5(paths, minSup, minRep, ref_item, ref_dset, cores, allow_para, seed)
         gep_list = ep_set.run_trenc()
 
         wr_line = "Algorithm: TRENC \n"
@@ -46,6 +47,7 @@ def init_trenc(paths, minSup, ref_item, ref_dset, cores, allow_para, minRep):
         wr_line += "Minimum representativity: " + str(minRep) + '\n'
         wr_line += "Multi-core execution: " + str(ep_set.msg_para) + '\n'
         wr_line += "Number of cores: " + str(ep_set.cores) + '\n'
+        wr_line += "Random seed: " + str(seed) + '\n'
         wr_line += "Number of patterns: " + str(len(gep_list)) + '\n'
         wr_line += '\n\n'
 
@@ -98,6 +100,7 @@ if __name__ == "__main__":
         ref_ds = sys.argv[5]
         allow_p = sys.argv[6]
         num_cores = 1
+        seed = None
     else:
         optparser = OptionParser()
         optparser.add_option('-f', '--inputFile',
@@ -140,6 +143,11 @@ if __name__ == "__main__":
                              help='number of cores',
                              default=0,
                              type='int')
+        optparser.add_option('-e', '--seed',
+                             dest='seed',
+                             help='random seed',
+                             default=None,
+                             type='int')
         (options, args) = optparser.parse_args()
         inFile = None
         if options.file is None:
@@ -155,10 +163,11 @@ if __name__ == "__main__":
         ref_ds = options.refDset
         allow_p = options.allowPara
         num_cores = options.numCores
+        seed = options.seed
 
     import time
     start = time.time()
-    res_text = init_trenc(file_path, min_sup, ref_col, ref_ds, num_cores, allow_p, min_rep)
+    res_text = init_trenc(file_path, min_sup, ref_col, ref_ds, num_cores, allow_p, min_rep, seed)
     end = time.time()
 
     wr_text = ("Run-time: " + str(end - start) + " seconds\n")
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of the ant colony (GradACO)
+
+"""
+
+import os
+import numpy as np
+import pytest
+from src.trenc.algorithms.common.aco_grad import GradACO
+from src.trenc.algorithms.common.aco_tgrad import T_GradACO
+from src.trenc.algorithms.common.graank_v2 import graank
+from src.trenc.algorithms.common.dataset import Dataset
+from src.trenc.algorithms.common.gp import GI, GP
+from src.trenc.algorithms.aco_grad_gr import GradACOgr
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'data', 'DATASET.csv')
+
+
+def get_set(patterns):
+    # patterns as a comparable set of (items, support)
+    return set([(frozenset(gp.to_string()), gp.support) for gp in patterns])
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_validate_gps(packed):
+    # a batch of ants is validated as each ant alone
+    ac = GradACO(DATASET, 0.3, False, packed=packed, seed=3)
+    patterns = [ac.generate_random_gp() for _ in range(40)]
+    lst_gps = ac.validate_gps(patterns)
+    assert len(lst_gps) == len(patterns)
+    for pattern, gen_gp in zip(patterns, lst_gps):
+        gp = ac.validate_gp(pattern)
+        assert gen_gp.to_string() == gp.to_string()
+        assert gen_gp.support == gp.support
+
+
+def test_batch_colony():
+    ac = GradACO(DATASET, 0.3, False, batch_size=8, seed=1)
+    patterns = ac.run_ant_colony()
+    assert len(patterns) > 0
+    for gp in patterns:
+        assert gp.support >= 0.3
+        assert ac.validate_gp(gp).support == gp.support
+
+
+@pytest.mark.parametrize('batch_size', [0, 8])
+def test_budget_max_ants(batch_size):
+    # the default max_repeat does not stop the colony before the other budgets
+    ac = GradACO(DATASET, 0.3, False, batch_size=batch_size, seed=1)
+    ac.set_budget(max_ants=200)
+    assert ac.max_repeat == 0
+    ac.run_ant_colony()
+    assert ac.num_ants == 200
+    ac.set_budget(max_gens=30)
+    ac.run_ant_colony()
+    assert ac.num_gens == 30
+
+
+def test_budget_max_repeat():
+    ac = GradACO(DATASET, 0.3, False, seed=1)
+    ac.set_budget()
+    assert ac.max_repeat == 1
+    ac.set_budget(max_ants=200, max_repeat=2)
+    ac.run_ant_colony()
+    assert ac.num_ants < 200
+    with pytest.raises(Exception):
+        ac.set_budget(max_repeat=0)
+
+
+@pytest.mark.parametrize('use_threads', [True, False])
+def test_multi_colony(use_threads):
+    # the merged winners of 2 colonies are the patterns of graank (small data set)
+    ac = GradACO(DATASET, 0.3, False, seed=5)
+    ac.set_colonies(2, colony_gens=10, use_threads=use_threads)
+    ac.set_budget(max_gens=80)
+    patterns = ac.run_ant_colony()
+    assert ac.num_gens == 80
+    assert get_set(patterns) == get_set(graank(DATASET, 0.3)[1])
+
+
+def test_merge_colony_states():
+    # the deposits of every colony are added to the (decayed) start state
+    ac = GradACO(DATASET, 0.3, False)
+    state = {'p_matrix': np.ones((2, 3))}
+    results = [{'state': {'p_matrix': np.array([[1, 3, 1], [1, 1, 1]], dtype=float)}, 'decay': 1},
+               {'state': {'p_matrix': np.array([[0.5, 0.5, 1.5], [0.5, 0.5, 0.5]], dtype=float)}, 'decay': 0.5}]
+    merged = ac.merge_colony_states(state, results)
+    np.testing.assert_allclose(merged['p_matrix'], [[0.75, 2.75, 1.75], [0.75, 0.75, 0.75]])
+
+
+@pytest.mark.parametrize('batch_size', [0, 8])
+def test_seeded_run(batch_size):
+    # a seeded run is reproducible: same winners (in the same order) and ants
+    runs = list()
+    for _ in range(2):
+        ac = GradACO(DATASET, 0.3, False, batch_size=batch_size, seed=11)
+        ac.set_budget(max_ants=100)
+        patterns = ac.run_ant_colony()
+        runs.append(([(gp.to_string(), gp.support) for gp in patterns], ac.p_matrix.tolist()))
+    assert runs[0] == runs[1]
+
+
+def test_seeded_steps():
+    # every step has its own stream: serial and pool runs find the same patterns
+    runs = list()
+    for parallel in [False, True]:
+        t_aco = T_GradACO(DATASET, False, 1, 0.3, 0.5, 2, seed=11)
+        t_aco.set_budget(max_ants=60)
+        lst_tgps = [obj for obj in t_aco.run_tgraank(parallel=parallel) if obj]
+        runs.append([[(tgp.to_string(), tgp.support, tgp.time_lag.to_string()) for tgp in obj]
+                     for obj in lst_tgps])
+    assert len(runs[0]) > 0
+    assert runs[0] == runs[1]
+
+
+def test_carry_steps():
+    # chunks of consecutive steps carry pheromone and winners: serial and pool runs agree
+    runs = list()
+    for parallel in [False, True]:
+        t_aco = T_GradACO(DATASET, False, 1, 0.3, 0.5, 2, seed=11)
+        t_aco.set_carry(3, carry_weight=0.5)
+        assert [list(chunk) for chunk in t_aco.get_chunks()] == [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+        lst_tgps = [obj for obj in t_aco.run_tgraank(parallel=parallel) if obj]
+        runs.append([[(tgp.to_string(), tgp.support) for tgp in obj] for obj in lst_tgps])
+    assert len(runs[0]) > 0
+    assert runs[0] == runs[1]
+
+
+def test_carry_prior():
+    # the colony of step s + 1 samples from the weighted pheromone of step s
+    t_aco = T_GradACO(DATASET, False, 1, 0.3, 0.5, 2, seed=11)
+    t_aco.set_carry(2, carry_weight=0.5)
+    t_aco.carry = [None, None, ()]
+    t_aco.fetch_patterns(0)
+    ac_1 = t_aco.carry[0]
+    t_aco.carry = [ac_1, 0.5 * (ac_1.p_matrix - 1), list(ac_1.winner_gps)]
+    t_aco.fetch_patterns(1)
+    ac_2 = t_aco.carry[0]
+    assert ac_2 is not ac_1
+    np.testing.assert_allclose(ac_2.p_prior, 0.5 * (ac_1.p_matrix - 1))
+
+
+def test_pairs_prior():
+    # the prior of the frequent canonical pairs is applied once
+    ac = GradACO(DATASET, 0.3, False, seed=1)
+    ac.set_prior(np.ones((ac.d_set.column_size, 3)))
+    ac.init_pairs()
+    prior = ac.pheromone.prior.copy()
+    ac.init_pairs()
+    ac.set_pairs()
+    ac.set_budget(max_ants=50)
+    ac.run_ant_colony()
+    np.testing.assert_array_equal(ac.pheromone.prior, prior)
+    np.testing.assert_array_equal(prior, ac.pair_prior + 1)
+    # (1+, 4-) is frequent, (1+, 4+) is not: the prior of 4 is not symmetric
+    assert ac.pair_supps[2, 9] >= 0.3 > ac.pair_supps[2, 8]
+    assert ac.pair_prior[4, 0] != ac.pair_prior[4, 1]
+
+
+def test_pairs_colony():
+    ac = GradACO(DATASET, 0.3, False, seed=1)
+    ac.set_pairs()
+    ac.set_budget(max_ants=300)
+    patterns = ac.run_ant_colony()
+    assert ac.pair_supps is not None
+    assert get_set(patterns) == get_set(graank(DATASET, 0.3)[1])
+
+
+def test_pairs_steps():
+    # the colony of every step precomputes its 2-item supports
+    t_aco = T_GradACO(DATASET, False, 1, 0.3, 0.5, 1, seed=1)
+    t_aco.set_pairs()
+    t_aco.set_carry(2)
+    t_aco.carry = [None, None, ()]
+    t_aco.fetch_patterns(0)
+    assert t_aco.carry[0].pair_supps is not None
+
+
+def write_directio_csv(tmp_path, n=120):
+    # the first n rows of the Directio data set
+    f_path = tmp_path / 'directio.csv'
+    with open(os.path.join(os.path.dirname(DATASET), 'Directio_site6k.csv')) as f:
+        f_path.write_text(''.join(f.readlines()[0: n + 1]))
+    return str(f_path)
+
+
+@pytest.mark.parametrize('top_k', [1, 3, 5])
+@pytest.mark.parametrize('batch_size', [0, 8])
+def test_top_k(tmp_path, top_k, batch_size):
+    # the colony does not stop on max_repeat before it finds the k patterns
+    f_path = write_directio_csv(tmp_path)
+    ac = GradACO(f_path, 0.1, False, batch_size=batch_size, seed=1)
+    ac.set_top_k(top_k)
+    patterns = ac.run_ant_colony()
+    assert len(patterns) == top_k
+    assert ac.d_set.thd_supp == 0.1
+    # with an ants budget: the k patterns of graank
+    ac.set_budget(max_ants=1000)
+    patterns = ac.run_ant_colony()
+    assert get_set(patterns) == get_set(graank(f_path, 0.1, top_k=top_k)[1])
+
+
+
+def test_top_k_restore(tmp_path, monkeypatch):
+    # the threshold raised by top-k is restored when the colony fails too
+    f_path = write_directio_csv(tmp_path)
+    ac = GradACO(f_path, 0.1, False, seed=1)
+    ac.set_top_k(3)
+
+    def run_serial_colony():
+        ac.d_set.thd_supp = 0.5
+        raise RuntimeError()
+    monkeypatch.setattr(ac, 'run_serial_colony', run_serial_colony)
+    with pytest.raises(RuntimeError):
+        ac.run_ant_colony()
+    assert ac.d_set.thd_supp == 0.1
+
+
+def test_top_k_h5(tmp_path, monkeypatch):
+    # the h5 colony runs top-k like GradACO and keeps its pheromone in the h5 file
+    pytest.importorskip('h5py')
+    from src.trenc.algorithms.common.hdf5.aco_grad_h5 import GradACO_h5
+    f_path = write_directio_csv(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    ac = GradACO_h5(f_path, 0.1, False)
+    ac.set_seed(1)
+    ac.set_top_k(3)
+    patterns = ac.run_ant_colony()
+    assert len(patterns) == 3
+    assert ac.d_set.thd_supp == 0.1
+    grp = 'dataset/' + ac.d_set.step_name + '/p_matrix'
+    np.testing.assert_array_equal(ac.d_set.read_h5_dataset(grp), ac.p_matrix)
+
+@pytest.mark.parametrize('batch_size', [0, 8])
+def test_deposit_sampled_orientation(batch_size):
+    # an ant that samples (1-, 2-) deposits on 1- and 2-, the winner is reported as (1+, 2+)
+    for ac in [GradACO(DATASET, 0.3, False, batch_size=batch_size), GradACOgr(Dataset(DATASET, 0.3))]:
+        ac.batch_size = batch_size
+        gp = GP()
+        gp.add_gradual_item(GI(1, '-'))
+        gp.add_gradual_item(GI(2, '-'))
+        ac.set_prior(None, [gp])
+        ac.set_budget(max_ants=1)
+        patterns = ac.run_ant_colony()
+        assert [obj.to_string() for obj in patterns] == [['1+', '2+']]
+        np.testing.assert_array_equal(ac.p_matrix[1: 3, 0], [1, 1])
+        assert np.all(ac.p_matrix[1: 3, 1] > 1)
+        if isinstance(ac, GradACOgr):
+            np.testing.assert_array_equal(ac.steps_matrix[1: 3], [[0, 1, 0], [0, 1, 0]])
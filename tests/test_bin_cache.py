@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of the LRU cache of partial AND bins (BinCache)
+
+"""
+
+import os
+import numpy as np
+from src.trenc.algorithms.common.bin_cache import BinCache
+from src.trenc.algorithms.common.aco_grad import GradACO
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'data', 'DATASET.csv')
+
+
+def test_evict_by_count():
+    cache = BinCache(max_size=2, max_bytes=2 ** 20)
+    for key in [(0, 2), (0, 4), (2, 4)]:
+        cache.put(key, np.zeros(8, dtype=bool), 0.5)
+    assert len(cache) == 2
+    assert cache.get((0, 2)) is None
+    assert cache.get((0, 4)) is not None
+    # (0, 4) was used last: (2, 4) is evicted first
+    cache.put((0, 6), np.zeros(8, dtype=bool), 0.5)
+    assert cache.get((2, 4)) is None
+    assert cache.get((0, 4)) is not None
+    assert cache.hits == 2 and cache.misses == 2
+
+
+def test_evict_by_bytes():
+    cache = BinCache(max_size=100, max_bytes=250)
+    for i in range(3):
+        cache.put((0, 2 * i + 2), np.zeros(100, dtype=bool), 0.5)
+    assert len(cache) == 2
+    assert cache.num_bytes == 200
+    assert cache.get((0, 2)) is None
+    # a bin larger than the cache is not stored
+    cache.put((0, 8), np.zeros(300, dtype=bool), 0.5)
+    assert cache.get((0, 8)) is None
+    assert cache.num_bytes == 200
+
+
+def test_cached_colony():
+    # the cached colony finds the same winners as the plain one
+    runs = list()
+    for use_cache in [False, True]:
+        ac = GradACO(DATASET, 0.3, False, seed=2)
+        if use_cache:
+            ac.set_cache(max_size=4)
+        ac.set_budget(max_ants=100)
+        patterns = ac.run_ant_colony()
+        runs.append([(gp.to_string(), gp.support) for gp in patterns])
+    assert runs[0] == runs[1]
+    assert ac.bin_cache.hits > 0
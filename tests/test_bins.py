@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of the dense, bit-packed and matrix-free bins of gradual items
+
+"""
+
+import numpy as np
+import pytest
+from src.trenc.algorithms.common.dataset import Dataset
+from src.trenc.algorithms.common.bin_store import BinStore, inv_bin
+from src.trenc.algorithms.common.rank_supp import RankBin
+from src.border_ep.algorithms.border_graank import GraankInit
+
+
+def get_columns(n=37, k=3, seed=1):
+    # integer columns (with ties) and a nan
+    rng = np.random.default_rng(seed)
+    cols = rng.integers(0, 8, size=(k, n)).astype(float)
+    cols[0, 5] = np.nan
+    return cols
+
+
+@pytest.mark.parametrize('equal', [False, True])
+def test_packed_bins(equal):
+    cols = get_columns()
+    n = cols.shape[1]
+    dense = [Dataset.bin_rank(col, equal=equal) for col in cols]
+    packed = [Dataset.bin_rank_packed(col, equal=equal) for col in cols]
+    for d_bin, p_bin in zip(dense, packed):
+        assert p_bin.dtype == np.uint64
+        assert Dataset.count_bin(p_bin) == np.count_nonzero(d_bin)
+        np.testing.assert_array_equal(Dataset.unpack_bin(p_bin, n), d_bin)
+    # supports of the AND of packed bins
+    assert Dataset.count_bin(packed[0] & packed[1] & packed[2]) == \
+        np.count_nonzero(dense[0] & dense[1] & dense[2])
+
+
+def test_popcount():
+    words = np.array([0, 1, 3, 2 ** 63, 2 ** 64 - 1], dtype=np.uint64)
+    assert Dataset.popcount(words) == 0 + 1 + 2 + 1 + 64
+
+
+def test_popcount_fallback(monkeypatch):
+    # numpy < 2.0 has no bitwise_count
+    monkeypatch.delattr(np, 'bitwise_count', raising=False)
+    words = np.array([0, 1, 3, 2 ** 63, 2 ** 64 - 1], dtype=np.uint64)
+    assert Dataset.popcount(words, chunk_size=2) == 0 + 1 + 2 + 1 + 64
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_inv_bins(packed):
+    # the '-' bin is a view of the '+' bin
+    for col in get_columns():
+        pos_bin = Dataset.bin_rank(col, packed=packed)
+        neg_bin = inv_bin(pos_bin)
+        assert np.shares_memory(neg_bin, pos_bin)
+        np.testing.assert_array_equal(neg_bin, Dataset.bin_rank(-col, packed=packed))
+
+
+@pytest.mark.parametrize('equal', [False, True])
+def test_matrix_free_bins(equal):
+    # dominance counts of the matrix-free bins equal the concordant pairs of the dense bins
+    cols = get_columns(n=300)
+    for signs in [(1, 1, 1), (1, -1, 1), (-1, 1, -1)]:
+        dense = None
+        free = None
+        for col, sign in zip(cols, signs):
+            d_bin = Dataset.bin_rank(sign * col, equal=equal)
+            f_bin = RankBin(sign * col, equal)
+            dense = d_bin if dense is None else (dense & d_bin)
+            free = f_bin if free is None else (free & f_bin)
+            assert Dataset.count_bin(free) == np.count_nonzero(dense)
+        rows = np.unique(np.argwhere(dense)[:, 0:2])
+        np.testing.assert_array_equal(np.unique(free.get_indices()), rows)
+
+
+@pytest.mark.parametrize('equal', [False, True])
+def test_count_rank_pairs(equal):
+    # 1-item supports from the tie counts
+    for col in get_columns():
+        assert Dataset.count_rank_pairs(col, equal) == np.count_nonzero(Dataset.bin_rank(col, equal=equal))
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_bin_store(packed):
+    cols = get_columns()
+    bins = np.array([Dataset.bin_rank(col, packed=packed) for col in cols[[0, 2]]])
+    store = BinStore([1, 4], bins, 5)
+    assert store.get_slot(1) == 0 and store.get_slot(4) == 1
+    assert store.get_slot(0) < 0 and store.get_bin(2, '+') is None
+    np.testing.assert_array_equal(store.get_bin(4, '+'), bins[1])
+    np.testing.assert_array_equal(store.get_bin(4, '-'), inv_bin(bins[1]))
+    temp_bins = store.gather([(4, '-'), (1, '+'), (1, b'-')])
+    for temp_bin, (col, symbol) in zip(temp_bins, [(4, '-'), (1, '+'), (1, '-')]):
+        np.testing.assert_array_equal(temp_bin, store.get_bin(col, symbol))
+    # gather returns copies: the stored bins are unchanged
+    np.testing.assert_array_equal(store.bins[1], bins[1])
+    assert [obj[0] for obj in store.get_valid_bins()] == [(1, b'+'), (1, b'-'), (4, b'+'), (4, b'-')]
+
+
+def test_bin_store_matrix_free():
+    cols = get_columns()
+    store = BinStore([0, 1], [RankBin(cols[0]), RankBin(cols[1])], 3)
+    temp_bins = store.gather([(1, '-'), (0, '+')])
+    assert temp_bins[0].count() == RankBin(-cols[1]).count()
+    assert temp_bins[1] is store.bins[0]
+
+
+def test_h5_format(tmp_path, monkeypatch):
+    # an h5 file of another layout is rebuilt, the current one is read back
+    h5py = pytest.importorskip('h5py')
+    from src.trenc.algorithms.common.hdf5.dataset_h5 import Dataset_h5, H5_FORMAT
+    monkeypatch.chdir(tmp_path)
+    f_path = tmp_path / 'data.csv'
+    f_path.write_text("a,b\n1,4\n2,3\n3,3\n0,1\n")
+    d_set = Dataset_h5(str(f_path))
+    d_set.init_attributes()
+    assert Dataset_h5.is_current_h5(d_set.h5_file)
+    assert Dataset_h5(str(f_path)).attr_data is None
+    # old layout: no format, '+' and '-' bins
+    with h5py.File(d_set.h5_file, 'r+') as h5f:
+        del h5f.attrs['format']
+    assert not Dataset_h5.is_current_h5(d_set.h5_file)
+    d_set = Dataset_h5(str(f_path))
+    np.testing.assert_array_equal(d_set.attr_data, [[1, 2, 3, 0], [4, 3, 3, 1]])
+    d_set.init_attributes()
+    with h5py.File(d_set.h5_file, 'r') as h5f:
+        assert h5f.attrs['format'] == H5_FORMAT
+        assert '0_pos' in h5f['dataset/step_0/valid_bins']
+
+
+@pytest.mark.parametrize('equal', [False, True])
+def test_border_graank_init(equal):
+    # the tie-count precheck keeps the 1-item bins (built without a) of the valid columns only
+    cols = get_columns(n=12, k=3).tolist()
+    cols[0][5] = 3.0
+    cols.append([1.0] * 10 + [2.0, 3.0])
+    n = len(cols[0])
+    for a in [0.1, 0.4, 0.5]:
+        all_bins = GraankInit(cols, equal)
+        kept = [(items, bin_data) for items, bin_data in all_bins
+                if float(np.count_nonzero(bin_data)) / float(n * (n - 1.0) / 2.0) >= a]
+        res = GraankInit(cols, equal, a)
+        assert [items for items, _ in res] == [items for items, _ in kept]
+        for (_, bin_data), (_, exp_data) in zip(res, kept):
+            np.testing.assert_array_equal(bin_data, exp_data)
+    if not equal:
+        # the near-constant column is skipped
+        assert len(GraankInit(cols, equal, 0.5)) < len(GraankInit(cols, equal))
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of the typed columnar store (Dataset.read_csv)
+
+"""
+
+import numpy as np
+import pytest
+from src.trenc.algorithms.common.dataset import Dataset
+
+
+def write_csv(tmp_path, text):
+    f_path = tmp_path / 'data.csv'
+    f_path.write_text(text)
+    return str(f_path)
+
+
+def test_columnar_store(tmp_path):
+    f_path = write_csv(tmp_path, "Time,a,b\n2018-01-01,1,4\n2018-01-02,2,x\n2018-01-03,3,6\n")
+    d_set = Dataset(f_path)
+    assert d_set.attr_data.dtype == np.float64
+    assert d_set.attr_data.shape == (3, 3)
+    assert list(d_set.time_cols) == [0]
+    assert list(d_set.attr_cols) == [1, 2]
+    np.testing.assert_array_equal(d_set.attr_data[1], [1, 2, 3])
+    # non-numeric values are stored as NaN
+    np.testing.assert_array_equal(d_set.attr_data[2], [4, np.nan, 6])
+    assert list(d_set.time_data[0]) == ['2018-01-01', '2018-01-02', '2018-01-03']
+
+
+def test_columnar_store_no_title(tmp_path):
+    f_path = write_csv(tmp_path, "1,4\n2,5\n3,6\n")
+    d_set = Dataset(f_path)
+    assert d_set.title.size == 0
+    np.testing.assert_array_equal(d_set.attr_data, [[1, 2, 3], [4, 5, 6]])
+
+
+def test_typed_columns(tmp_path):
+    # float32 columns are ranked as they are stored: not cast to float64 again
+    f_path = write_csv(tmp_path, "a,b\n1,4\n2.5,3\n3,3\n0.5,1\n")
+    d_set = Dataset(f_path, dtype=np.float32)
+    assert d_set.attr_data.dtype == np.float32
+    col_data = d_set.attr_data[0]
+    assert Dataset.as_float(col_data) is col_data
+    for packed in [False, True]:
+        bins = d_set.rank_cols([d_set.attr_data[0], d_set.attr_data[1]], packed=packed)
+        bins_64 = d_set.rank_cols([d_set.attr_data[0].astype(np.float64), d_set.attr_data[1].astype(np.float64)],
+                                  packed=packed)
+        np.testing.assert_array_equal(bins, bins_64)
+
+
+def test_reject_single_row(tmp_path):
+    f_path = write_csv(tmp_path, "a,b\n1,2\n")
+    with pytest.raises(Exception, match="file has no data"):
+        Dataset(f_path)
+
+
+def test_reject_title_only(tmp_path):
+    f_path = write_csv(tmp_path, "a,b\n")
+    with pytest.raises(Exception, match="file has no data"):
+        Dataset(f_path)
+
+
+def test_time_stamps(tmp_path):
+    f_path = write_csv(tmp_path, "Time,a\n2018-01-01,1\n2018-01-03,2\n2018-01-06,3\n")
+    d_set = Dataset(f_path)
+    assert d_set.time_stamps.dtype == np.int64
+    ok, time_diffs = d_set.get_time_diffs(1)
+    assert ok
+    np.testing.assert_array_equal(time_diffs[:, 0], [2 * 86400, 3 * 86400])
+
+
+def test_parse_timestamps():
+    # a non-ISO format is inferred from the values, invalid values become NAT_STAMP
+    stamps = Dataset.parse_timestamps(['01/02/2018 10:00', '13/02/2018 10:00', 'bad'])
+    assert stamps[1] - stamps[0] == 12 * 86400
+    assert stamps[2] == np.iinfo(np.int64).min
+
+
+def test_step_bins(tmp_path):
+    # bins of a step are views of the full bins and equal the bins of the shifted data
+    f_path = write_csv(tmp_path, "Time,a,b,c\n" + "".join(
+        "2018-01-%02d,%d,%d,%d\n" % (i + 1, (i * 7) % 5, (i * 3) % 4, i % 3) for i in range(12)))
+    d_set = Dataset(f_path)
+    for step in [1, 3]:
+        d_set.update_step_bins(step, 1)
+        n = d_set.size - step
+        assert d_set.attr_size == n
+        for col in d_set.attr_cols:
+            data = d_set.attr_data[col][0: n] if col == 1 else d_set.attr_data[col][step:]
+            for symbol in ['+', '-']:
+                bin_data = d_set.bin_store.get_bin(col, symbol)
+                if bin_data is None:
+                    continue
+                assert np.shares_memory(bin_data, d_set.full_bins)
+                expected = Dataset.bin_rank(data if symbol == '+' else -data)
+                np.testing.assert_array_equal(bin_data, expected)
+
+
+def test_invalid_bins_not_built(tmp_path):
+    # b is constant: its 1-item support is 0 and its bins are never built
+    f_path = write_csv(tmp_path, "a,b,c\n1,5,3\n2,5,1\n3,5,2\n4,5,4\n")
+    d_set = Dataset(f_path, min_sup=0.5)
+    d_set.init_attributes()
+    assert list(d_set.bin_store.cols) == [0, 2]
+    assert d_set.bin_store.get_bin(1, '+') is None
+    assert sorted(set([int(obj[0]) for obj in d_set.invalid_bins])) == [1]
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of graank (gradual pattern mining)
+
+"""
+
+import os
+import numpy as np
+import pytest
+from src.trenc.algorithms.common.graank_v2 import graank, gen_apriori_candidates, join_candidates, inv, \
+    is_canonical
+from src.trenc.algorithms.common.dataset import Dataset
+from src.trenc.algorithms.common.sparse_bin import SparseBin
+from src.trenc.algorithms.common.gp import GI, GP
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'data', 'DATASET.csv')
+
+
+def write_random_csv(tmp_path, n=30, k=6, seed=4):
+    # correlated integer columns: deep patterns
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 20, size=n)
+    cols = [base + rng.integers(0, 6, size=n) * (1 + i % 3) for i in range(k)]
+    cols[1] = -cols[1]
+    f_path = tmp_path / 'data.csv'
+    lines = [','.join(['a' + str(i) for i in range(k)])]
+    lines.extend([','.join([str(col[r]) for col in cols]) for r in range(n)])
+    f_path.write_text('\n'.join(lines) + '\n')
+    return str(f_path)
+
+
+def get_set(patterns):
+    # patterns as a comparable set of (items, support)
+    return set([(frozenset(gp.to_string()), gp.support) for gp in patterns])
+
+
+def test_canonical_patterns():
+    d_set, patterns = graank(DATASET, 0.3)
+    assert len(patterns) > 0
+    lst_items = [frozenset(gp.to_string()) for gp in patterns]
+    for gp in patterns:
+        assert gp.is_canonical()
+        # the inverse pattern is not reported
+        inv_items = frozenset([gi[:-1] + ('-' if gi[-1] == '+' else '+') for gi in gp.to_string()])
+        assert inv_items not in lst_items
+
+
+def test_to_canonical():
+    gp = GP()
+    gp.add_gradual_item(GI(2, '-'))
+    gp.add_gradual_item(GI(1, '-'))
+    gp.add_gradual_item(GI(3, '+'))
+    assert not gp.is_canonical()
+    assert gp.to_canonical().to_string() == ['2+', '1+', '3-']
+
+
+def join_pairs(R):
+    # the join of all the pairs i < j of R (before join_candidates)
+    res = []
+    seen = []
+    lst_sets = [set(x[0]) if not isinstance(x[0], tuple) else {x[0]} for x in R]
+    for i in range(len(R) - 1):
+        for j in range(i + 1, len(R)):
+            temp = lst_sets[i] | lst_sets[j]
+            if not is_canonical(temp):
+                continue
+            inv_temp = {inv(x) for x in temp}
+            if (len(temp) == len(lst_sets[0]) + 1) and (temp not in seen) and (inv_temp not in seen):
+                test = True
+                for k in temp:
+                    temp2 = temp - {k}
+                    if (temp2 not in lst_sets) and ({inv(x) for x in temp2} not in lst_sets):
+                        test = False
+                        break
+                if test:
+                    res.append((temp, i, j))
+                seen.append(temp)
+    return res
+
+
+def test_join_candidates():
+    # the prefix join finds the candidates (and the pair of subsets) of the join of all pairs
+    d_set = Dataset(DATASET, 0.1)
+    d_set.init_attributes()
+    n = d_set.attr_size
+    valid_bins = list(d_set.valid_bins)
+    levels = 0
+    while len(valid_bins) > 1:
+        res = join_candidates(valid_bins)
+        assert res == join_pairs(valid_bins)
+        valid_bins = gen_apriori_candidates(valid_bins, 0.1, n)
+        levels += 1
+    assert levels >= 2
+
+
+@pytest.mark.parametrize('min_sup', [0.2, 0.3, 0.5])
+def test_depth_first(tmp_path, min_sup):
+    # the depth-first miner finds the patterns of the level-wise miner
+    for f_path in [DATASET, write_random_csv(tmp_path)]:
+        bfs_patterns = graank(f_path, min_sup)[1]
+        dfs_patterns = graank(f_path, min_sup, depth_first=True)[1]
+        assert get_set(dfs_patterns) == get_set(bfs_patterns)
+
+
+@pytest.mark.parametrize('min_sup', [0.05, 0.02])
+def test_depth_first_sparse(tmp_path, monkeypatch, min_sup):
+    # low supports: the deep nodes switch to sparse bins and find the same patterns
+    from_bin = SparseBin.from_bin
+    lst_calls = list()
+
+    def count_calls(bin_data):
+        lst_calls.append(1)
+        return from_bin(bin_data)
+
+    monkeypatch.setattr(SparseBin, 'from_bin', staticmethod(count_calls))
+    f_path = write_random_csv(tmp_path, n=60)
+    dfs_patterns = graank(f_path, min_sup, depth_first=True)[1]
+    assert len(lst_calls) > 0
+    assert get_set(dfs_patterns) == get_set(graank(f_path, min_sup)[1])
+
+
+@pytest.mark.parametrize('min_sup', [0.1, 0.3])
+def test_num_cores(tmp_path, min_sup):
+    # the prefix classes mined by 2 processes give the patterns of the serial miners
+    for f_path in [DATASET, write_random_csv(tmp_path, n=60)]:
+        bfs_patterns = graank(f_path, min_sup)[1]
+        pool_patterns = graank(f_path, min_sup, num_cores=2)[1]
+        assert len(pool_patterns) > 0
+        assert get_set(pool_patterns) == get_set(bfs_patterns)
+        assert get_set(pool_patterns) == get_set(graank(f_path, min_sup, depth_first=True)[1])
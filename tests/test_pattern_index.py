@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of the bitmask and set-trie index of winner (loser) patterns
+
+"""
+
+import numpy as np
+from src.trenc.algorithms.common.pattern_index import PatternIndex
+from src.trenc.algorithms.common.aco_grad import GradACO
+from src.trenc.algorithms.common.gp import GI, GP
+
+
+def get_random_gp(rng, num_cols=6):
+    gp = GP()
+    for col in rng.permutation(num_cols)[0: rng.integers(1, 5)]:
+        gp.add_gradual_item(GI(int(col), '+' if rng.random() < 0.5 else '-'))
+    return gp
+
+
+def test_pattern_index():
+    # the index answers as the scans of GradACO
+    rng = np.random.default_rng(7)
+    stored = [get_random_gp(rng) for _ in range(30)]
+    index = PatternIndex()
+    for gp in stored:
+        index.append(gp)
+    assert len(index) == len(stored)
+    for _ in range(300):
+        gp = get_random_gp(rng)
+        assert index.contains(gp) == GradACO.is_duplicate(gp, stored, [])
+        assert index.has_superset(gp) == GradACO.check_anti_monotony(stored, gp, subset=True)
+        assert index.has_subset(gp) == GradACO.check_anti_monotony(stored, gp, subset=False)
+
+
+def test_pattern_index_inverse():
+    gp = GP()
+    gp.add_gradual_item(GI(1, '+'))
+    gp.add_gradual_item(GI(3, '-'))
+    inv_gp = GP()
+    inv_gp.add_gradual_item(GI(3, '+'))
+    inv_gp.add_gradual_item(GI(1, '-'))
+    index = PatternIndex()
+    index.append(gp)
+    assert index.contains(inv_gp)
+    assert index.has_superset(inv_gp) and index.has_subset(inv_gp)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of the pheromone engine of the ACO variants
+
+"""
+
+import os
+import numpy as np
+from src.trenc.algorithms.common.pheromone import Pheromone
+from src.trenc.algorithms.common.pheromone_store import PheromoneStore
+from src.trenc.algorithms.common.aco_grad import GradACO
+from src.trenc.algorithms.common.gp import GI, GP
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'data', 'DATASET.csv')
+
+
+def get_gp(items):
+    gp = GP()
+    for col, symbol in items:
+        gp.add_gradual_item(GI(col, symbol))
+    return gp
+
+
+def test_deposit():
+    pheromone = Pheromone(np.ones((4, 3)))
+    pheromone.deposit([1, 2, 3], get_gp([(1, '+'), (3, '-')]))
+    np.testing.assert_array_equal(pheromone.p_matrix, [[1, 1, 1], [2, 1, 1], [1, 1, 2], [1, 2, 1]])
+    # cumulative probabilities of '+' and '+ or -'
+    np.testing.assert_allclose(pheromone.cum_probs[1], [0.5, 0.75])
+    np.testing.assert_allclose(pheromone.cum_probs[2], [0.25, 0.5])
+
+
+def test_sample():
+    p_matrix = np.array([[1, 1, 1], [8, 1, 1], [1, 8, 1], [1, 1, 8]], dtype=float)
+    pheromone = Pheromone(p_matrix, np.random.default_rng(0))
+    counts = {(col, symbol): 0 for col in range(4) for symbol in ['+', '-']}
+    for _ in range(2000):
+        cols, symbols = pheromone.sample([1, 2, 3])
+        assert 0 not in cols
+        for col, symbol in zip(cols, symbols):
+            counts[(int(col), str(symbol))] += 1
+    assert abs(counts[(1, '+')] / 2000.0 - 0.8) < 0.05
+    assert abs(counts[(2, '-')] / 2000.0 - 0.8) < 0.05
+    assert abs((counts[(3, '+')] + counts[(3, '-')]) / 2000.0 - 0.2) < 0.05
+
+
+
+def test_store_round_trip(tmp_path):
+    store = PheromoneStore(str(tmp_path), weight=0.5)
+    ac = GradACO(DATASET, 0.3, False, seed=1)
+    assert not store.load(ac)
+    ac.run_ant_colony()
+    store.save(ac, tag='a')
+    # same data: loaded as it is
+    new_ac = GradACO(DATASET, 0.3, False)
+    assert not store.load(new_ac, tag='b')
+    assert store.load(new_ac, tag='a')
+    np.testing.assert_array_equal(new_ac.p_matrix, ac.p_matrix)
+
+
+def test_store_similar_data(tmp_path):
+    # same columns, other rows: the checkpoint is scaled by weight
+    f_path = tmp_path / 'data.csv'
+    with open(DATASET) as f:
+        f_path.write_text(''.join(f.readlines()[0: 12]))
+    store = PheromoneStore(str(tmp_path / 'cp'), weight=0.5)
+    ac = GradACO(DATASET, 0.3, False, seed=1)
+    ac.run_ant_colony()
+    store.save(ac)
+    new_ac = GradACO(str(f_path), 0.3, False)
+    assert store.load(new_ac)
+    np.testing.assert_allclose(new_ac.p_matrix - 1, 0.5 * (ac.p_matrix - 1))
+
+
+def test_prior():
+    # the prior is used for sampling only
+    pheromone = Pheromone(np.ones((2, 3)), prior=np.array([[3, 0, 0], [0, 0, 0]], dtype=float))
+    np.testing.assert_allclose(pheromone.cum_probs[0], [4 / 6.0, 5 / 6.0])
+    np.testing.assert_array_equal(pheromone.p_matrix, np.ones((2, 3)))
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of the sparse bins of the depth-first miner (SparseBin)
+
+"""
+
+import os
+import numpy as np
+import pytest
+from src.trenc.algorithms.common.dataset import Dataset
+from src.trenc.algorithms.common.sparse_bin import SparseBin
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'data', 'DATASET.csv')
+
+
+def get_rows(indices):
+    # (row, col) positions as a sorted list
+    return sorted([tuple(obj) for obj in np.asarray(indices).tolist()])
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_sparse_bin(packed):
+    # a SparseBin counts and locates the pairs of the dense or packed bins ('-' views included)
+    d_set = Dataset(DATASET, 0.1, packed=packed)
+    d_set.init_attributes()
+    n = d_set.attr_size
+    valid_bins = d_set.valid_bins
+    for i in range(len(valid_bins)):
+        for j in range(len(valid_bins)):
+            if valid_bins[i][0][0] >= valid_bins[j][0][0]:
+                continue
+            bin_data = valid_bins[i][1] & valid_bins[j][1]
+            sparse_bin = SparseBin.from_bin(bin_data)
+            count = Dataset.count_bin(bin_data)
+            assert sparse_bin.count() == count
+            assert get_rows(sparse_bin.get_indices(n)) == get_rows(Dataset.get_bin_indices(bin_data, n))
+            for k in range(len(valid_bins)):
+                if valid_bins[k][0][0] in [valid_bins[i][0][0], valid_bins[j][0][0]]:
+                    continue
+                ext_bin = bin_data & valid_bins[k][1]
+                ext_count = Dataset.count_bin(ext_bin)
+                assert sparse_bin.get_lost_count(valid_bins[k][1]) == count - ext_count
+                ext_set = sparse_bin & valid_bins[k][1]
+                assert ext_set.count() == ext_count
+                assert get_rows(ext_set.get_indices(n)) == get_rows(Dataset.get_bin_indices(ext_bin, n))
+
+
+def test_is_sparse():
+    bin_data = np.zeros((8, 8), dtype=bool)
+    assert SparseBin.is_sparse(bin_data, 3)
+    assert not SparseBin.is_sparse(bin_data, 4)
+    assert not SparseBin.is_sparse(None, 0)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+@author: "Dickson Owuor"
+@license: "MIT"
+@email: "owuordickson@gmail.com"
+
+Description:
+    tests of the supports of a temporal pattern for all the steps at once (step_supp)
+
+"""
+
+import os
+import numpy as np
+from src.trenc.algorithms.common.dataset import Dataset
+from src.trenc.algorithms.common.t_graank import Tgrad
+from src.trenc.algorithms.common.aco_tgrad import T_GradACO
+from src.trenc.algorithms.common.gp import GI, GP
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'data', 'DATASET.csv')
+
+
+def get_gp(items):
+    gp = GP()
+    for col, symbol in items:
+        gp.add_gradual_item(GI(col, symbol))
+    return gp
+
+
+def get_step_support(d_set, gp, step, ref_col):
+    # support of gp from the bins of one step
+    d_set.update_step_bins(step, ref_col)
+    n = d_set.attr_size
+    bin_data = None
+    for gi in gp.gradual_items:
+        temp_bin = d_set.get_bin(gi)
+        if temp_bin is None:
+            return 0
+        bin_data = temp_bin if bin_data is None else (bin_data & temp_bin)
+    return float(Dataset.count_bin(bin_data)) / float(n * (n - 1.0) / 2.0)
+
+
+def test_step_supports():
+    ref_col = 1
+    max_step = 8
+    for items in [[(1, '+'), (2, '+')], [(1, '+'), (3, '-')], [(2, '+'), (4, '+')],
+                  [(1, '+'), (2, '+'), (4, '-')]]:
+        gp = get_gp(items)
+        d_set = Dataset(DATASET)
+        supports = d_set.get_step_supports(gp, ref_col, max_step)
+        expected = [get_step_support(d_set, gp, step, ref_col) for step in range(1, max_step + 1)]
+        np.testing.assert_allclose(supports, expected)
+
+
+def test_step_supports_matrix_free():
+    gp = get_gp([(1, '+'), (2, '+'), (4, '-')])
+    supports = Dataset(DATASET).get_step_supports(gp, 1, 8)
+    free_supports = Dataset(DATASET, matrix_free=True).get_step_supports(gp, 1, 8)
+    np.testing.assert_allclose(supports, free_supports)
+
+
+def test_run_tgraank_skips_steps():
+    # steps without a frequent pair are not mined, the patterns are the same
+    t_grad = Tgrad(DATASET, False, 1, 0.6, 0.5, 1)
+    steps = t_grad.get_valid_steps()
+    assert len(steps) < t_grad.max_step
+    patterns = t_grad.run_tgraank()
+    all_patterns = [t_grad.fetch_patterns(step) for step in range(t_grad.max_step)]
+    all_patterns = [obj for obj in all_patterns if obj]
+    assert len(patterns) == len(all_patterns)
+    for lst_1, lst_2 in zip(patterns, all_patterns):
+        assert [(tgp.to_string(), tgp.support) for tgp in lst_1] == \
+               [(tgp.to_string(), tgp.support) for tgp in lst_2]
+
+
+def get_tgps(lst_patterns):
+    return [[(tgp.to_string(), tgp.support) for tgp in obj] for obj in lst_patterns if obj]
+
+
+def test_run_tgraank_pool():
+    # the workers of the pool inherit the full bins: same patterns as the serial run
+    t_grad = Tgrad(DATASET, False, 1, 0.6, 0.5, 2)
+    assert get_tgps(t_grad.run_tgraank(parallel=True)) == get_tgps(t_grad.run_tgraank())
+
+
+def test_valid_steps_matrix_free():
+    # matrix-free (and packed) data sets never build the dense full bins to skip steps
+    for kwargs in [{'matrix_free': True}, {'packed': True}]:
+        t_grad = Tgrad(DATASET, False, 1, 0.6, 0.5, 1, **kwargs)
+        assert t_grad.get_valid_steps() == list(range(t_grad.max_step))
+        assert t_grad.d_set.full_bins is None
+
+
+def test_aco_run_tgraank_skips_steps():
+    # the colonies of the steps without a frequent pair are not run (serial and pool)
+    t_aco = T_GradACO(DATASET, False, 1, 0.6, 0.5, 2, seed=1)
+    steps = t_aco.get_valid_steps()
+    assert len(steps) < t_aco.max_step
+    all_patterns = get_tgps([t_aco.fetch_patterns(step) for step in range(t_aco.max_step)])
+    assert get_tgps(t_aco.run_tgraank()) == all_patterns
+    assert get_tgps(t_aco.run_tgraank(parallel=True)) == all_patterns